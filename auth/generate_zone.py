@@ -11,12 +11,36 @@ Naming scheme: n{index:04d}.{base32_chunk}.zone.test.
 
 import argparse
 import base64
+import string
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import List, Tuple
 
 
+# Zone header (SOA and NS records), compiled once at import. '$$' escapes
+# the zone file's own $ORIGIN/$TTL directives.
+_HEADER_TMPL = string.Template("""$$ORIGIN ${zone}.
+$$TTL ${ttl}
+
+; SOA Record
+@   IN  SOA ns1.${zone}. admin.${zone}. (
+        ${serial}    ; Serial
+        3600        ; Refresh (1 hour)
+        900         ; Retry (15 minutes)
+        604800      ; Expire (1 week)
+        ${ttl}       ; Minimum TTL (negative cache)
+    )
+
+; NS Record
+@       IN  NS  ns1.${zone}.
+ns1     IN  A   192.0.2.1
+
+; Payload nodes - each name encodes a chunk of the message
+; These will be linked via NSEC records after signing
+""")
+
+
 def encode_chunk_base32(chunk: bytes) -> str:
     """
     Encode a chunk of bytes as base32 without padding.
@@ -59,29 +83,47 @@ def chunk_message(message: bytes, chunk_size: int) -> List[bytes]:
     Returns:
         List of byte chunks
     """
-    chunks = []
-    for i in range(0, len(message), chunk_size):
-        chunk = message[i:i+chunk_size]
-        # Pad last chunk with underscores if needed
-        if len(chunk) < chunk_size:
-            chunk = chunk + b'_' * (chunk_size - len(chunk))
-        chunks.append(chunk)
-    return chunks
+    # Pad once up front so every slice is already full-size
+    padded = message + b'_' * ((-len(message)) % chunk_size)
+    return [padded[i:i+chunk_size] for i in range(0, len(padded), chunk_size)]
+
+
+def encode_message_bulk(message: bytes, chunk_size: int) -> List[str]:
+    """
+    Chunk and encode a message with a single base32 call.
+    
+    When chunk_size is a multiple of 5, chunk boundaries line up with
+    base32's 40-bit groups, so the padded message is encoded once and
+    sliced. Other chunk sizes are encoded chunk by chunk.
+    
+    Args:
+        message: The message bytes to encode
+        chunk_size: Size of each chunk in bytes
+        
+    Returns:
+        List of lowercase base32 strings, one per chunk
+    """
+    if chunk_size % 5 != 0:
+        return [encode_chunk_base32(c) for c in chunk_message(message, chunk_size)]
+    
+    padded = message + b'_' * ((-len(message)) % chunk_size)
+    encoded = base64.b32encode(padded).decode('ascii').lower()
+    label_len = chunk_size * 8 // 5
+    return [encoded[i:i+label_len] for i in range(0, len(encoded), label_len)]
 
 
-def generate_node_name(index: int, chunk: bytes, zone: str) -> Tuple[str, str]:
+def generate_node_name(index: int, encoded: str, zone: str) -> Tuple[str, str]:
     """
-    Generate a node name for a payload chunk.
+    Generate a node name for an encoded payload chunk.
     
     Args:
         index: Node index (0-based)
-        chunk: The payload chunk bytes
+        encoded: The base32 encoded payload chunk
         zone: The zone name (without trailing dot)
         
     Returns:
         Tuple of (full_name, encoded_payload_label)
     """
-    encoded = encode_chunk_base32(chunk)
     labels = split_into_labels(encoded)
     payload_part = '.'.join(labels)
     
@@ -112,45 +154,33 @@ def generate_zone_file(
         Number of nodes created
     """
     message_bytes = message.encode('utf-8')
-    chunks = chunk_message(message_bytes, chunk_size)
+    chunks = encode_message_bulk(message_bytes, chunk_size)
     
     # Serial number from current date/time
     serial = datetime.now().strftime('%Y%m%d%H')
     
-    # Build zone content
-    zone_content = f"""$ORIGIN {zone}.
-$TTL {ttl}
-
-; SOA Record
-@   IN  SOA ns1.{zone}. admin.{zone}. (
-        {serial}    ; Serial
-        3600        ; Refresh (1 hour)
-        900         ; Retry (15 minutes)
-        604800      ; Expire (1 week)
-        {ttl}       ; Minimum TTL (negative cache)
-    )
-
-; NS Record
-@       IN  NS  ns1.{zone}.
-ns1     IN  A   192.0.2.1
-
-; Payload nodes - each name encodes a chunk of the message
-; These will be linked via NSEC records after signing
-"""
-    
-    # Generate node records
-    for i, chunk in enumerate(chunks):
-        node_name, _ = generate_node_name(i, chunk, zone)
-        # Remove the trailing zone and dot for the record
-        relative_name = node_name.replace(f'.{zone}.', '')
-        zone_content += f"{relative_name}    IN  A   192.0.2.{i + 10}\n"
+    # Zone header; node records are streamed after it
+    header = _HEADER_TMPL.substitute(zone=zone, ttl=ttl, serial=serial)
     
-    # Add a sentinel/end marker node
-    end_index = len(chunks)
-    zone_content += f"n{end_index:04d}.end    IN  A   192.0.2.254\n"
+    # Index labels for every node plus the end marker, formatted once
+    name_prefixes = ['n%04d' % i for i in range(len(chunks) + 1)]
     
-    # Write the zone file
-    output_path.write_text(zone_content)
+    def record_lines():
+        for i, encoded in enumerate(chunks):
+            payload_part = '.'.join(split_into_labels(encoded))
+            # Records are written relative to $ORIGIN
+            relative_name = f"{name_prefixes[i]}.{payload_part}"
+            yield f"{relative_name}    IN  A   192.0.2.{i + 10}\n"
+        
+        # Add a sentinel/end marker node
+        end_index = len(chunks)
+        yield f"{name_prefixes[end_index]}.end    IN  A   192.0.2.254\n"
+    
+    # Stream the zone file through a large buffer rather than building
+    # the whole zone in memory first
+    with output_path.open('w', buffering=1 << 20) as f:
+        f.write(header)
+        f.writelines(record_lines())
     
     print(f"[+] Generated zone file with {len(chunks)} payload nodes")
     print(f"[+] Message: {message}")
@@ -9,18 +9,35 @@ This library provides tools for:
 """
 
 from .encoder import encode_chunk, split_into_labels, chunk_message
-from .decoder import decode_labels, decode_chunk
+from .decoder import decode_labels, decode_chunk, decode_labels_bulk, decode_payload
 from .ordering import (
     node_name_for_index,
+    index_labels,
     in_gap_name,
+    in_gap_names,
     is_name_between,
+    CanonName,
     extract_index_from_name,
 )
-from .parser import (
-    extract_nsec_from_response,
-    extract_next_name,
-    extract_payload_from_next_name,
-)
+
+# The parser depends on dnspython, which takes longer to import than the
+# rest of the package combined and is not needed for encoding, decoding
+# or zone generation, so its exports are loaded on first access
+_PARSER_EXPORTS = frozenset({
+    'ZoneContext',
+    'extract_nsec_from_response',
+    'extract_next_name',
+    'extract_payload_from_next_name',
+    'extract_payloads',
+})
+
+
+def __getattr__(name):
+    if name in _PARSER_EXPORTS:
+        from . import parser
+        return getattr(parser, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     # Encoder
@@ -30,15 +47,22 @@ __all__ = [
     # Decoder
     'decode_labels',
     'decode_chunk',
+    'decode_labels_bulk',
+    'decode_payload',
     # Ordering
     'node_name_for_index',
+    'index_labels',
     'in_gap_name',
+    'in_gap_names',
     'is_name_between',
+    'CanonName',
     'extract_index_from_name',
     # Parser
+    'ZoneContext',
     'extract_nsec_from_response',
     'extract_next_name',
     'extract_payload_from_next_name',
+    'extract_payloads',
 ]
 
 __version__ = '1.0.0'
@@ -0,0 +1,164 @@
+"""
+Command-line entry points for the NSEC Cache Datastore library
+
+Provides the zone generator as the `nsec-generate-zone` console script
+(see pyproject.toml), so it runs from an installed package without any
+sys.path manipulation:
+
+    nsec-generate-zone --zone zone.test --message "hello" --output zone.test.db
+    python -m nsecchain.cli --zone zone.test ...
+"""
+
+import argparse
+import string
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Union
+
+from .encoder import encode_message_bulk, chunk_message, split_into_labels
+from .ordering import index_labels
+
+
+# Zone header (SOA and NS records), compiled once at import. '$$' escapes
+# the zone file's own $ORIGIN/$TTL directives.
+_HEADER_TMPL = string.Template("""$$ORIGIN ${zone}.
+$$TTL ${ttl}
+
+; SOA Record
+@   IN  SOA ns1.${zone}. admin.${zone}. (
+        ${serial}    ; Serial
+        3600        ; Refresh (1 hour)
+        900         ; Retry (15 minutes)
+        604800      ; Expire (1 week)
+        ${ttl}       ; Minimum TTL (negative cache)
+    )
+
+; NS Record
+@       IN  NS  ns1.${zone}.
+ns1     IN  A   192.0.2.1
+
+; ============================================================
+; Payload nodes - each name encodes a chunk of the message
+; These will be linked via NSEC records after signing
+; ============================================================
+""")
+
+
+def generate_zone_file(
+    zone: str,
+    message: Union[str, bytes],
+    chunk_size: int,
+    ttl: int,
+    output_path: Path
+) -> int:
+    """
+    Generate a complete unsigned zone file.
+    
+    Args:
+        zone: Zone name (without trailing dot)
+        message: Message to encode in the NSEC chain (str is encoded as
+            UTF-8, bytes are used as-is)
+        chunk_size: Bytes per chunk
+        ttl: TTL for records
+        output_path: Path to write the zone file
+        
+    Returns:
+        Number of nodes created
+    """
+    message_bytes = message.encode('utf-8') if isinstance(message, str) else message
+    chunks = chunk_message(message_bytes, chunk_size)
+    encoded_chunks = encode_message_bulk(message_bytes, chunk_size)
+    
+    # Serial number from current date/time
+    serial = datetime.now().strftime('%Y%m%d%H')
+    
+    print(f"[+] Encoding message: {message}")
+    print(f"[+] Chunk size: {chunk_size} bytes")
+    print(f"[+] Number of chunks: {len(chunks)}")
+    
+    # Zone header; node records are streamed after it
+    header = _HEADER_TMPL.substitute(zone=zone, ttl=ttl, serial=serial)
+    
+    # Hoisted out of the loop: the absolute suffix used for logging and
+    # the index labels for every node plus the end marker
+    zone_suffix = f".{zone}."
+    name_prefixes = index_labels(len(chunks) + 1)
+    
+    # Stream the zone file through a large buffer rather than building
+    # the whole zone in memory first
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open('w', buffering=1 << 20) as f:
+        f.write(header)
+        
+        # Generate node records
+        for i, (chunk, encoded) in enumerate(zip(chunks, encoded_chunks)):
+            labels = split_into_labels(encoded)
+            payload_part = '.'.join(labels)
+            
+            # The full name relative to zone
+            node_name = f"{name_prefixes[i]}.{payload_part}"
+            
+            f.write(f"{node_name}    IN  A   192.0.2.{10 + i}\n")
+            print(f"    Node {i}: {node_name}{zone_suffix} -> {chunk}")
+        
+        # Add a sentinel/end marker node (helps with NSEC chain termination)
+        end_index = len(chunks)
+        f.write(f"\n; End marker\n{name_prefixes[end_index]}.end    IN  A   192.0.2.254\n")
+    
+    print(f"[+] Zone file written to: {output_path}")
+    
+    return len(chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate DNS zone with payload encoded in node names'
+    )
+    parser.add_argument(
+        '--zone', '-z',
+        default='zone.test',
+        help='Zone name (default: zone.test)'
+    )
+    parser.add_argument(
+        '--message', '-m',
+        default='hello from nsec cache datastore',
+        help='Message to encode'
+    )
+    parser.add_argument(
+        '--chunk-size', '-c',
+        type=int,
+        default=8,
+        help='Chunk size in bytes (default: 8)'
+    )
+    parser.add_argument(
+        '--ttl', '-t',
+        type=int,
+        default=60,
+        help='TTL for records (default: 60)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        default='zone.test.db',
+        help='Output zone file path'
+    )
+    
+    args = parser.parse_args()
+    
+    output_path = Path(args.output)
+    
+    num_nodes = generate_zone_file(
+        zone=args.zone,
+        message=args.message,
+        chunk_size=args.chunk_size,
+        ttl=args.ttl,
+        output_path=output_path
+    )
+    
+    print(f"[+] Generated {num_nodes} payload nodes")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Helpers shared by the priming and verification scripts.
+
+Kept in the package rather than next to the scripts so they import the
+same way whether a script is run by path or as a module.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json module
+    orjson = None
+
+
+# Per-log checkpoint of (inode, offset, count) so that repeated calls
+# only scan what was appended since the previous one. The offset always
+# sits just after a newline, so a partially written last line is
+# counted on the next call rather than split across two.
+_log_checkpoints: Dict[str, Tuple[int, int, int]] = {}
+
+# BIND9 query log format: "client @... (name): query: name IN type"
+_QUERY_MARKER = b'query:'
+
+# Bytes of the mapped log copied out per bytes.count() call
+_SCAN_BLOCK = 1 << 20
+
+
+def _count_markers(mm: mmap.mmap, start: int, end: int) -> int:
+    """Count query markers in mm[start:end], one bounded block at a time."""
+    count = 0
+    # Each block overlaps the next by one byte less than the marker, so
+    # a marker straddling a boundary is counted exactly once
+    overlap = len(_QUERY_MARKER) - 1
+    for pos in range(start, end, _SCAN_BLOCK):
+        count += mm[pos:min(pos + _SCAN_BLOCK + overlap, end)].count(_QUERY_MARKER)
+    return count
+
+
+def _count_rotated_tail(rotated_path: str, inode: int, offset: int) -> int:
+    """Count markers past offset in a rotated log, if it is the file we were reading."""
+    try:
+        if os.stat(rotated_path).st_ino != inode:
+            return 0
+        with open(rotated_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _count_markers(mm, offset, len(mm))
+    except (OSError, ValueError):
+        # Missing, already rotated further, or empty (cannot be mapped)
+        return 0
+
+
+def count_auth_queries(log_path: str) -> int:
+    """
+    Count the number of queries in the authoritative server log.
+    
+    The first call scans the whole log; later calls for the same path
+    resume from where the previous one stopped. If BIND rotated the log
+    in between (it renames it to <log>.0, see 'versions' in named.conf),
+    the rest of the rotated file is counted before the new one, so the
+    running count stays continuous. A truncated log restarts the count.
+    
+    Args:
+        log_path: Path to the auth query log file
+        
+    Returns:
+        Number of query lines found
+    """
+    try:
+        if not os.path.exists(log_path):
+            return 0
+        
+        st = os.stat(log_path)
+        inode, offset, count = _log_checkpoints.get(log_path, (st.st_ino, 0, 0))
+        if inode != st.st_ino:
+            count += _count_rotated_tail(log_path + '.0', inode, offset)
+            inode, offset = st.st_ino, 0
+        elif st.st_size < offset:
+            inode, offset, count = st.st_ino, 0, 0
+        
+        if st.st_size == offset:
+            _log_checkpoints[log_path] = (inode, offset, count)
+            return count
+        
+        with open(log_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Only complete lines move the checkpoint forward
+            end = max(mm.rfind(b'\n', offset) + 1, offset)
+            count += _count_markers(mm, offset, end)
+            partial = _count_markers(mm, end, len(mm))
+        
+        _log_checkpoints[log_path] = (inode, end, count)
+        return count + partial
+    except Exception as e:
+        print(f"[!] Warning: Could not read auth log: {e}")
+        return 0
+
+
+def positive_int(value: str) -> int:
+    """argparse type for an integer of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """argparse type for an integer of at least 0."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {number}")
+    return number
+
+
+def non_negative_float(value: str) -> float:
+    """argparse type for a number of at least 0."""
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {value}")
+    return number
+
+
+def wait_for_log_flush(
+    log_path: str,
+    settle: float = 0.3,
+    max_wait: float = 2.0,
+    interval: float = 0.05
+) -> None:
+    """
+    Wait until the auth log has stopped growing.
+    
+    Replaces a fixed sleep before the final count_auth_queries call:
+    returns once the log size has been stable for `settle` seconds and
+    over at least two consecutive reads, and never waits longer than
+    `max_wait`. BIND9 buffers its query log, so a short settle time can
+    return between two buffer flushes and undercount.
+    
+    Args:
+        log_path: Path to the auth query log file
+        settle: How long the size must stay unchanged
+        max_wait: Upper bound on the total wait
+        interval: Polling interval
+    """
+    start = time.monotonic()
+    stable_since = start
+    stable_reads = 0
+    last_size = None
+    
+    while True:
+        try:
+            size = os.stat(log_path).st_size
+        except OSError:
+            return
+        
+        now = time.monotonic()
+        if size != last_size:
+            last_size, stable_since, stable_reads = size, now, 0
+        else:
+            stable_reads += 1
+            if stable_reads >= 2 and now - stable_since >= settle:
+                return
+        if now - start >= max_wait:
+            return
+        time.sleep(interval)
+
+
+def write_results(path: Path, results: Dict[str, Any]) -> None:
+    """
+    Write a results dictionary as indented JSON, creating parent dirs.
+    
+    Uses orjson when it is installed, which serializes straight to
+    bytes in C; otherwise the stdlib json module. Both write UTF-8 with
+    non-ASCII text unescaped, so strings and integers come out the same
+    on either path; very large or small floats may be spelled
+    differently (1e+16 vs 1e16) but parse to the same value.
+    
+    Args:
+        path: Output file path
+        results: JSON-serializable results
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(results, indent=2, ensure_ascii=False),
+                        encoding='utf-8')
+
+
+def read_results(path: Path) -> Dict[str, Any]:
+    """
+    Read a results file written by write_results.
+    
+    Args:
+        path: Results file path
+        
+    Returns:
+        The decoded results dictionary
+    """
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
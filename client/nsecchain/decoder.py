@@ -4,19 +4,43 @@ Payload Decoder for NSEC Cache Datastore
 Decodes base32-encoded DNS labels back to original payload bytes.
 """
 
-import base64
 from typing import List, Optional
 
 
-def decode_labels(labels: str) -> bytes:
+def _reverse_table(alphabet: str) -> dict:
+    """
+    Build a str.translate table mapping alphabet (either case) onto the
+    base32hex digits that int(..., 32) understands. Dots are dropped, '='
+    padding is kept for decode_labels to strip, and every other ASCII
+    character maps to '!' so it can be rejected up front.
+    """
+    table = {c: '!' for c in range(128)}
+    for value, char in enumerate(alphabet):
+        table[ord(char)] = _B32HEX_DIGITS[value]
+        table[ord(char.lower())] = _B32HEX_DIGITS[value]
+    table[ord('.')] = None
+    table[ord('=')] = '='
+    return table
+
+
+# Reverse lookup tables for the RFC 4648 base32 and base32hex alphabets
+_B32HEX_DIGITS = '0123456789abcdefghijklmnopqrstuv'
+_REVERSE_TABLES = {
+    'base32': _reverse_table('ABCDEFGHIJKLMNOPQRSTUVWXYZ234567'),
+    'base32hex': _reverse_table('0123456789ABCDEFGHIJKLMNOPQRSTUV'),
+}
+
+
+def decode_labels(labels: str, encoding: str = 'base32') -> bytes:
     """
     Decode base32-encoded DNS labels back to bytes.
     
-    Handles labels that may be dot-separated (from multi-label encoding)
-    and adds proper base32 padding.
+    Handles labels that may be dot-separated (from multi-label encoding),
+    in either case, with or without trailing '=' padding.
     
     Args:
         labels: Base32 encoded string (may contain dots)
+        encoding: 'base32' (default) or 'base32hex'
         
     Returns:
         Decoded bytes
@@ -24,24 +48,40 @@ def decode_labels(labels: str) -> bytes:
     Example:
         >>> decode_labels('nbswy3dp')
         b'hello'
+        >>> decode_labels('d1imor3f', encoding='base32hex')
+        b'hello'
     """
-    # Remove dots if present (multi-label encoding)
-    clean = labels.replace('.', '')
+    table = _REVERSE_TABLES.get(encoding)
+    if table is None:
+        raise ValueError(f"Unknown encoding '{encoding}' (expected one of: "
+                         f"{', '.join(_REVERSE_TABLES)})")
     
-    # Uppercase for base32 decoding
-    clean = clean.upper()
+    # Map to base32hex digits, dropping dots (multi-label encoding).
+    # base64.b32decode walks the input one character at a time in
+    # Python; translate() and int() do the same work in C.
+    padded = labels.translate(table)
+    digits = padded.rstrip('=')
     
-    # Add padding (base32 requires padding to multiple of 8)
-    padding_needed = (8 - len(clean) % 8) % 8
-    clean = clean + '=' * padding_needed
+    # Characters outside the alphabet were mapped to '!' (or left as
+    # non-ASCII), so one scan rejects them, and any '=' left inside the
+    # string, before int() ever sees them
+    if '!' in digits or '=' in digits or not digits.isascii():
+        raise ValueError(f"Failed to decode base32 labels '{labels}': Non-base32 digit found")
     
-    try:
-        return base64.b32decode(clean)
-    except Exception as e:
-        raise ValueError(f"Failed to decode base32 labels '{labels}': {e}")
+    # '=' may only complete the last 8-character quantum, and unpadded
+    # base32 never leaves 1, 3 or 6 characters in it
+    if ((len(digits) + 7) >> 3 != (len(padded) + 7) >> 3
+            or (len(digits) & 7) in (1, 3, 6)):
+        raise ValueError(f"Failed to decode base32 labels '{labels}': Incorrect padding")
+    if not digits:
+        return b''
+    
+    # Each character carries 5 bits; drop the trailing partial byte
+    bits = len(digits) * 5
+    return (int(digits, 32) >> (bits & 7)).to_bytes(bits >> 3, 'big')
 
 
-def decode_chunk(encoded: str) -> bytes:
+def decode_chunk(encoded: str, encoding: str = 'base32') -> bytes:
     """
     Decode a single encoded chunk.
     
@@ -49,11 +89,12 @@ def decode_chunk(encoded: str) -> bytes:
     
     Args:
         encoded: Base32 encoded string
+        encoding: 'base32' (default) or 'base32hex'
         
     Returns:
         Decoded bytes
     """
-    return decode_labels(encoded)
+    return decode_labels(encoded, encoding)
 
 
 def strip_padding(data: bytes, padding_char: bytes = b'_') -> bytes:
@@ -72,18 +113,105 @@ def strip_padding(data: bytes, padding_char: bytes = b'_') -> bytes:
     return data.rstrip(padding_char)
 
 
-def decode_payload_chunks(encoded_chunks: List[str]) -> bytes:
+def decode_labels_bulk(
+    encoded_chunks: List[str],
+    encoding: str = 'base32'
+) -> bytes:
+    """
+    Decode multiple encoded chunks into one concatenated byte string.
+    
+    When every chunk but the last encodes a whole number of 5-byte
+    groups (a multiple of 8 base32 characters), the chunks form one
+    continuous base32 stream and are decoded with a single call.
+    Otherwise the chunks are translated and validated together and only
+    the integer conversion is done per chunk.
+    
+    Args:
+        encoded_chunks: List of base32 encoded strings (may contain dots)
+        encoding: 'base32' (default) or 'base32hex'
+        
+    Returns:
+        Concatenated decoded bytes
+    """
+    # decode_labels drops dots during its single translate pass, so only
+    # count them here rather than building dot-free copies of each chunk
+    joined = ''.join(encoded_chunks)
+    if '=' in joined:
+        # Padding ends a base32 stream, so padded chunks cannot be joined
+        return b''.join(decode_labels(c, encoding) for c in encoded_chunks)
+    
+    sizes = [len(c) - c.count('.') for c in encoded_chunks]
+    if not any(n & 7 for n in sizes[:-1]):
+        return decode_labels(joined, encoding)
+    
+    table = _REVERSE_TABLES.get(encoding)
+    digits = joined.translate(table) if table else '!'
+    if ('!' in digits or not digits.isascii()
+            or any((n & 7) in (1, 3, 6) for n in sizes)):
+        # Let decode_labels find and report the offending chunk
+        return b''.join(decode_labels(c, encoding) for c in encoded_chunks)
+    
+    parts = []
+    pos = 0
+    for n in sizes:
+        if n:
+            bits = n * 5
+            parts.append((int(digits[pos:pos + n], 32) >> (bits & 7))
+                         .to_bytes(bits >> 3, 'big'))
+            pos += n
+    return b''.join(parts)
+
+
+def decode_payload_chunks(
+    encoded_chunks: List[str],
+    encoding: str = 'base32'
+) -> bytes:
     """
     Decode multiple encoded chunks and concatenate.
     
     Args:
         encoded_chunks: List of base32 encoded strings
+        encoding: 'base32' (default) or 'base32hex'
         
     Returns:
         Concatenated decoded bytes with padding stripped
     """
-    decoded = b''.join(decode_labels(c) for c in encoded_chunks)
-    return strip_padding(decoded)
+    return strip_padding(decode_labels_bulk(encoded_chunks, encoding))
+
+
+def decode_payload(chunks: List[str]) -> str:
+    """
+    Decode payload chunks gathered from NSEC next names into a message.
+    
+    The whole payload is decoded in one pass when every chunk is valid.
+    Otherwise chunks that fail to decode are reported and skipped so that
+    one bad NSEC record does not lose the rest of the payload.
+    
+    Args:
+        chunks: List of base32 encoded payload strings
+        
+    Returns:
+        Decoded message string (invalid UTF-8 is replaced)
+    """
+    try:
+        decoded = decode_labels_bulk(chunks)
+    except ValueError:
+        decoded = _decode_each(chunks)
+    
+    return strip_padding(decoded).decode('utf-8', errors='replace')
+
+
+def _decode_each(chunks: List[str]) -> bytes:
+    """Decode chunks one at a time, reporting and skipping bad ones."""
+    decoded = bytearray()
+    
+    for chunk in chunks:
+        try:
+            decoded += decode_labels(chunk)
+        except ValueError as e:
+            print(f"[!] Warning: Failed to decode chunk '{chunk}': {e}")
+    
+    return bytes(decoded)
 
 
 def extract_payload_labels(fqdn: str, zone: str) -> Optional[str]:
@@ -6,13 +6,103 @@ Base32 is chosen because:
 - Uses only alphanumeric characters (A-Z, 2-7)
 - No special characters that could cause DNS issues
 - Case-insensitive (DNS is case-insensitive)
+
+The base32hex alphabet (RFC 4648 section 7, 0-9 and A-V) is available
+via encoding='base32hex'; its labels sort in the same order as the
+bytes they encode.
 """
 
 import base64
-from typing import List
+import struct
+from typing import Iterable, List, Union
+
+
+# Lowercase alphabets and every two-character pair (10 bits), used by
+# the integer-based encoders for chunk-sized inputs
+_ALPHABETS = {
+    'base32': 'abcdefghijklmnopqrstuvwxyz234567',
+    'base32hex': '0123456789abcdefghijklmnopqrstuv',
+}
+_PAIRS = {
+    encoding: [a + b for a in alphabet for b in alphabet]
+    for encoding, alphabet in _ALPHABETS.items()
+}
+_ENCODERS = {
+    'base32': base64.b32encode,
+    'base32hex': base64.b32hexencode,
+}
+
+# Inputs up to this many bytes are encoded through a single integer;
+# beyond it the big-int shifts cost more than base64's 5-byte groups
+_INT_ENCODE_MAX = 128
+
+
+def _check_encoding(encoding: str) -> None:
+    """Raise ValueError for an unsupported encoding name."""
+    if encoding not in _ALPHABETS:
+        raise ValueError(f"Unknown encoding '{encoding}' (expected one of: "
+                         f"{', '.join(_ALPHABETS)})")
+
+
+def _encode_words64(values: Iterable[int], encoding: str = 'base32') -> List[str]:
+    """
+    Encode 64-bit values (8-byte chunks) as 13 lowercase base32 characters each.
+    
+    64 bits are shifted left by one to fill 13 five-bit characters,
+    which are emitted as six table pairs plus a final character.
+    """
+    pairs = _PAIRS[encoding]
+    alphabet = _ALPHABETS[encoding]
+    encoded = []
+    for v in values:
+        v <<= 1
+        encoded.append(pairs[v >> 55] + pairs[(v >> 45) & 1023] +
+                       pairs[(v >> 35) & 1023] + pairs[(v >> 25) & 1023] +
+                       pairs[(v >> 15) & 1023] + pairs[(v >> 5) & 1023] +
+                       alphabet[v & 31])
+    return encoded
+
+
+def _encode_groups40(data: bytes, encoding: str = 'base32') -> List[str]:
+    """
+    Encode each 5-byte group of data as 8 lowercase base32 characters.
+    
+    len(data) must be a multiple of 5. Each group is unpacked as a byte
+    and a 32-bit word, and its 40 bits are emitted as four table pairs.
+    """
+    pairs = _PAIRS[encoding]
+    encoded = []
+    for hi, lo in struct.iter_unpack('>BI', data):
+        v = hi << 32 | lo
+        encoded.append(pairs[v >> 30] + pairs[(v >> 20) & 1023] +
+                       pairs[(v >> 10) & 1023] + pairs[v & 1023])
+    return encoded
+
+
+def _encode_chunk_int(chunk: bytes, encoding: str = 'base32') -> str:
+    """
+    Encode a short chunk as lowercase unpadded base32 of any length.
+    
+    The bytes are read as one integer, shifted left to a whole number of
+    5-bit characters, and emitted as table pairs (plus one leading
+    character when the count is odd).
+    """
+    nchars = (len(chunk) * 8 + 4) // 5
+    shift = nchars * 5
+    v = int.from_bytes(chunk, 'big') << (shift - len(chunk) * 8)
+    pairs = _PAIRS[encoding]
+    
+    out = []
+    if nchars & 1:
+        shift -= 5
+        out.append(_ALPHABETS[encoding][v >> shift])
+    while shift:
+        shift -= 10
+        out.append(pairs[(v >> shift) & 1023])
+    return ''.join(out)
 
 
-def encode_chunk(chunk: bytes) -> str:
+def encode_chunk(chunk: bytes, encoding: str = 'base32') -> str:
     """
     Encode a chunk of bytes as DNS-safe base32 string.
     
@@ -21,6 +111,7 @@ def encode_chunk(chunk: bytes) -> str:
     
     Args:
         chunk: Raw bytes to encode (typically 8-16 bytes)
+        encoding: 'base32' (default) or 'base32hex'
         
     Returns:
         Lowercase base32 encoded string without padding
@@ -28,8 +119,18 @@ def encode_chunk(chunk: bytes) -> str:
     Example:
         >>> encode_chunk(b'hello')
         'nbswy3dp'
+        >>> encode_chunk(b'hello', encoding='base32hex')
+        'd1imor3f'
     """
-    encoded = base64.b32encode(chunk).decode('ascii')
+    _check_encoding(encoding)
+    
+    # Fast paths for the default chunk size and other chunk-sized inputs
+    if len(chunk) == 8:
+        return _encode_words64((int.from_bytes(chunk, 'big'),), encoding)[0]
+    if len(chunk) <= _INT_ENCODE_MAX:
+        return _encode_chunk_int(chunk, encoding)
+    
+    encoded = _ENCODERS[encoding](chunk).decode('ascii')
     # Remove padding and lowercase for DNS compatibility
     return encoded.rstrip('=').lower()
 
@@ -76,30 +177,78 @@ def chunk_message(message: bytes, chunk_size: int) -> List[bytes]:
         >>> chunk_message(b'hello', 3)
         [b'hel', b'lo_']
     """
-    chunks = []
-    for i in range(0, len(message), chunk_size):
-        chunk = message[i:i + chunk_size]
-        # Pad last chunk with underscores
-        if len(chunk) < chunk_size:
-            chunk = chunk + b'_' * (chunk_size - len(chunk))
-        chunks.append(chunk)
+    # Pad once up front (ensuring at least one chunk) so every slice
+    # is already full-size
+    pad = (-len(message)) % chunk_size if message else chunk_size
+    padded = message + b'_' * pad
+    return [padded[i:i + chunk_size]
+            for i in range(0, len(padded), chunk_size)]
+
+
+def encode_message_bulk(
+    message: bytes,
+    chunk_size: int,
+    encoding: str = 'base32'
+) -> List[str]:
+    """
+    Pad, chunk and encode a whole message in one pass.
+    
+    Base32 works on 5-byte (40-bit) groups, so when chunk_size is a
+    multiple of 5 every chunk boundary is also a group boundary: all
+    groups of the padded message are encoded in one loop and joined
+    chunk_size // 5 at a time. Other chunk sizes are encoded chunk by
+    chunk straight from the padded message; 8-byte chunks are unpacked
+    to integers with a single struct call.
+    
+    Args:
+        message: The message bytes to encode
+        chunk_size: Size of each chunk in bytes before encoding
+        encoding: 'base32' (default) or 'base32hex'
+        
+    Returns:
+        List of base32 encoded strings, one per chunk
+        
+    Example:
+        >>> encode_message_bulk(b'hello', 5)
+        ['nbswy3dp']
+    """
+    _check_encoding(encoding)
+    
+    # Pad to a whole number of chunks (at least one, as in chunk_message)
+    pad = (-len(message)) % chunk_size if message else chunk_size
+    padded = message + b'_' * pad
     
-    # Ensure at least one chunk
-    if not chunks:
-        chunks = [b'_' * chunk_size]
+    if chunk_size == 8:
+        words = struct.unpack('>%dQ' % (len(padded) // 8), padded)
+        return _encode_words64(words, encoding)
+    if chunk_size % 5 != 0:
+        encode = _encode_chunk_int if chunk_size <= _INT_ENCODE_MAX else encode_chunk
+        return [encode(padded[i:i + chunk_size], encoding)
+                for i in range(0, len(padded), chunk_size)]
     
-    return chunks
+    groups = _encode_groups40(padded, encoding)
+    per_chunk = chunk_size // 5
+    if per_chunk == 1:
+        return groups
+    return [''.join(groups[i:i + per_chunk])
+            for i in range(0, len(groups), per_chunk)]
 
 
-def encode_message(message: str, chunk_size: int = 8) -> List[str]:
+def encode_message(
+    message: Union[str, bytes],
+    chunk_size: int = 8,
+    encoding: str = 'base32'
+) -> List[str]:
     """
     Encode a complete message into a list of DNS-safe label strings.
     
     This is a convenience function that combines chunking and encoding.
     
     Args:
-        message: The message string to encode
+        message: The message to encode; strings are encoded as UTF-8,
+            bytes are used as-is
         chunk_size: Size of each chunk in bytes before encoding
+        encoding: 'base32' (default) or 'base32hex'
         
     Returns:
         List of base32 encoded strings, one per chunk
@@ -108,6 +257,6 @@ def encode_message(message: str, chunk_size: int = 8) -> List[str]:
         >>> encode_message('hello world', chunk_size=8)
         ['nbswy3dpeb3w64tm', 'onqxizi_']  # approximate
     """
-    message_bytes = message.encode('utf-8')
-    chunks = chunk_message(message_bytes, chunk_size)
-    return [encode_chunk(c) for c in chunks]
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    return encode_message_bulk(message, chunk_size, encoding)
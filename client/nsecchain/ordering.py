@@ -7,8 +7,45 @@ Provides utilities for:
 - Checking lexicographic ordering of DNS names
 """
 
+import functools
 import re
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple, Union
+
+
+# Pattern for the index label of a node name (e.g., 'n0001')
+_NODE_RE = re.compile(r'^n(\d+)$')
+
+# Index labels formatted once at import; every 4-digit index has an
+# entry, larger ones are formatted on demand by _index_label
+_INDEX_PREFIXES = tuple(['n%04d' % i for i in range(10000)])
+
+
+def _index_label(index: int) -> str:
+    """Return the 'nNNNN' label for an index, from the table when possible."""
+    if 0 <= index < 10000:
+        return _INDEX_PREFIXES[index]
+    return 'n%04d' % index
+
+
+def index_labels(count: int) -> Tuple[str, ...]:
+    """
+    Return the index labels ('n0000', 'n0001', ...) for 0..count-1.
+    
+    Args:
+        count: Number of labels
+        
+    Returns:
+        Tuple of labels, indexable by node index
+    """
+    if count <= 10000:
+        return _INDEX_PREFIXES[:count]
+    return _INDEX_PREFIXES + tuple(['n%04d' % i for i in range(10000, count)])
+
+
+@functools.lru_cache(maxsize=8)
+def _absolute_zone_suffix(zone: str) -> str:
+    """Return '.<zone>.' for a zone with or without its trailing dot."""
+    return '.' + zone.rstrip('.') + '.'
 
 
 def node_name_for_index(
@@ -35,11 +72,9 @@ def node_name_for_index(
         >>> node_name_for_index(0, 'nbswy3dp', 'zone.test')
         'n0000.nbswy3dp.zone.test.'
     """
-    zone = zone.rstrip('.')
-    name = f"n{index:04d}.{encoded_payload}.{zone}"
     if absolute:
-        name += '.'
-    return name
+        return _index_label(index) + '.' + encoded_payload + _absolute_zone_suffix(zone)
+    return _index_label(index) + '.' + encoded_payload + '.' + zone.rstrip('.')
 
 
 def in_gap_name(
@@ -72,11 +107,14 @@ def in_gap_name(
         >>> in_gap_name(0, 'zone.test', 'y')
         'n0000y.zone.test.'
     """
-    zone = zone.rstrip('.')
-    name = f"n{index:04d}{suffix}.{zone}"
     if absolute:
-        name += '.'
-    return name
+        return _index_label(index) + suffix + _absolute_zone_suffix(zone)
+    return _index_label(index) + suffix + '.' + zone.rstrip('.')
+
+
+# Suffixes for verification names: they fall between typical payloads
+# and come before 'z' (used for priming)
+_VERIFICATION_SUFFIXES = ['m', 'k', 'j', 'h', 'g', 'f', 'e', 'd', 'c', 'b']
 
 
 def verification_in_gap_name(index: int, zone: str, variant: int = 0) -> str:
@@ -95,14 +133,76 @@ def verification_in_gap_name(index: int, zone: str, variant: int = 0) -> str:
     Returns:
         A verification in-gap name
     """
-    # Use suffixes that are lexicographically between typical payloads
-    # and come before 'z' (used for priming)
-    suffixes = ['m', 'k', 'j', 'h', 'g', 'f', 'e', 'd', 'c', 'b']
-    suffix = suffixes[variant % len(suffixes)]
+    suffix = _VERIFICATION_SUFFIXES[variant % len(_VERIFICATION_SUFFIXES)]
     return in_gap_name(index, zone, suffix)
 
 
-def is_name_between(name: str, lower: str, upper: str) -> bool:
+def in_gap_names(count: int, zone: str, suffix: str = 'z') -> List[str]:
+    """
+    Generate the absolute in-gap names for nodes 0..count-1 in one pass.
+    
+    Equivalent to calling in_gap_name for each index, but the zone
+    suffix is built once for the whole batch.
+    
+    Args:
+        count: Number of nodes
+        zone: Zone name
+        suffix: Character to append (default 'z' for priming)
+        
+    Returns:
+        List of in-gap names, indexed by node
+        
+    Example:
+        >>> in_gap_names(2, 'zone.test')
+        ['n0000z.zone.test.', 'n0001z.zone.test.']
+    """
+    tail = suffix + _absolute_zone_suffix(zone)
+    return [label + tail for label in index_labels(count)]
+
+
+def verification_in_gap_names(count: int, zone: str, variant: int = 0) -> List[str]:
+    """
+    Generate the verification in-gap names for nodes 0..count-1.
+    
+    Args:
+        count: Number of nodes
+        zone: Zone name
+        variant: Which variant (0='m', 1='k', 2='j', etc.)
+        
+    Returns:
+        List of verification in-gap names, indexed by node
+    """
+    suffix = _VERIFICATION_SUFFIXES[variant % len(_VERIFICATION_SUFFIXES)]
+    return in_gap_names(count, zone, suffix)
+
+
+class CanonName:
+    """
+    A DNS name normalized once for repeated ordering comparisons.
+    
+    Holds the lowercased name without its trailing dot. Build bounds
+    with from_text before a loop and pass them to is_name_between.
+    """
+    __slots__ = ('_lc',)
+    
+    def __init__(self, normalized: str):
+        self._lc = normalized
+    
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def from_text(cls, name: str) -> 'CanonName':
+        """Normalize a name, reusing the result for recently seen names."""
+        return cls(name.lower().rstrip('.'))
+    
+    def __repr__(self) -> str:
+        return f"CanonName({self._lc!r})"
+
+
+def is_name_between(
+    name: Union[str, CanonName],
+    lower: Union[str, CanonName],
+    upper: Union[str, CanonName]
+) -> bool:
     """
     Check if a name falls lexicographically between two bounds.
     
@@ -116,14 +216,19 @@ def is_name_between(name: str, lower: str, upper: str) -> bool:
     Returns:
         True if lower < name < upper in canonical order
     """
-    # Normalize to lowercase for comparison
-    name = name.lower().rstrip('.')
-    lower = lower.lower().rstrip('.')
-    upper = upper.lower().rstrip('.')
+    # Normalize inline: at this size a helper call per argument costs
+    # as much as the comparison itself
+    from_text = CanonName.from_text
+    if isinstance(name, str):
+        name = from_text(name)
+    if isinstance(lower, str):
+        lower = from_text(lower)
+    if isinstance(upper, str):
+        upper = from_text(upper)
     
     # Simple string comparison works for our naming scheme
     # because we use consistent formatting (n0000, n0001, etc.)
-    return lower < name < upper
+    return lower._lc < name._lc < upper._lc
 
 
 def extract_index_from_name(name: str) -> Optional[int]:
@@ -136,17 +241,34 @@ def extract_index_from_name(name: str) -> Optional[int]:
     Returns:
         The index (1 in the example), or None if not a valid node name
     """
+    # Fast path: the zero-padded 4-digit indices this demo generates
+    digits = name[1:5]
+    if (name[:1] in ('n', 'N') and name[5:6] in ('.', '')
+            and digits.isascii() and digits.isdigit()):
+        return int(digits)
+    
     # Get the first label
-    first_label = name.split('.')[0].lower()
+    first_label = name.partition('.')[0].lower()
     
     # Check pattern: n followed by digits
-    match = re.match(r'^n(\d+)$', first_label)
+    match = _NODE_RE.match(first_label)
     if match:
         return int(match.group(1))
     
     return None
 
 
+@functools.lru_cache(maxsize=8)
+def _node_name_re(zone: str) -> 're.Pattern[str]':
+    """
+    Compile the pattern for a full node name in a zone.
+    
+    The zone is baked into the pattern, so a single fullmatch checks the
+    suffix and captures the index and payload without splitting labels.
+    """
+    return re.compile(r'n(\d+)\.(.*)\.' + re.escape(zone), re.DOTALL)
+
+
 def parse_node_name(name: str, zone: str) -> Optional[Tuple[int, str]]:
     """
     Parse a node name into its components.
@@ -158,31 +280,11 @@ def parse_node_name(name: str, zone: str) -> Optional[Tuple[int, str]]:
     Returns:
         Tuple of (index, encoded_payload) or None if invalid
     """
-    zone = zone.rstrip('.')
-    name = name.rstrip('.').lower()
-    
-    # Check zone suffix
-    zone_suffix = '.' + zone.lower()
-    if not name.endswith(zone_suffix):
-        return None
-    
-    # Remove zone
-    prefix = name[:-len(zone_suffix)]
-    
-    # Split into parts
-    parts = prefix.split('.')
-    if len(parts) < 2:
+    match = _node_name_re(zone.rstrip('.').lower()).fullmatch(name.rstrip('.').lower())
+    if match is None:
         return None
     
-    # Extract index from first part
-    index_match = re.match(r'^n(\d+)$', parts[0])
-    if not index_match:
-        return None
-    
-    index = int(index_match.group(1))
-    payload = '.'.join(parts[1:])
-    
-    return (index, payload)
+    return (int(match.group(1)), match.group(2))
 
 
 def get_next_node_index(current_name: str, zone: str) -> Optional[int]:
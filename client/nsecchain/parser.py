@@ -5,15 +5,49 @@ Provides utilities for extracting NSEC records and their 'next name'
 fields from DNS responses using dnspython.
 """
 
-from typing import List, Optional, Tuple
+import asyncio
+import socket
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import dns.asyncquery
+import dns.flags
 import dns.message
 import dns.name
+import dns.query
+import dns.rcode
 import dns.rdata
 import dns.rdatatype
 import dns.rrset
 import dns.resolver
 
 
+@dataclass(frozen=True)
+class ZoneContext:
+    """
+    Normalized forms of a zone name, computed once per zone.
+    
+    Parsing loops that handle many NSEC records for the same zone build
+    one ZoneContext and pass it in place of the zone string.
+    
+    Attributes:
+        zone_labels: Lowercase wire-form labels ((b'zone', b'test')), or
+            None for a non-ASCII zone, which no received name matches
+    """
+    zone_labels: Optional[Tuple[bytes, ...]]
+    
+    @classmethod
+    def from_zone(cls, zone: Union[str, 'ZoneContext']) -> 'ZoneContext':
+        """Build a context from a zone name, or return an existing one."""
+        if isinstance(zone, ZoneContext):
+            return zone
+        try:
+            zone_bytes = zone.lower().rstrip('.').encode('ascii')
+        except UnicodeEncodeError:
+            return cls(None)
+        return cls(tuple(zone_bytes.split(b'.')))
+
+
 def extract_nsec_from_response(response: dns.message.Message) -> List[dns.rrset.RRset]:
     """
     Extract all NSEC RRsets from a DNS response.
@@ -66,7 +100,7 @@ def extract_next_name(nsec_rrset: dns.rrset.RRset) -> Optional[dns.name.Name]:
 
 def extract_payload_from_next_name(
     next_name: dns.name.Name,
-    zone: str
+    zone: Union[str, ZoneContext]
 ) -> Optional[str]:
     """
     Extract the encoded payload labels from an NSEC next name.
@@ -75,65 +109,149 @@ def extract_payload_from_next_name(
     
     Args:
         next_name: The dns.name.Name object from NSEC next field
-        zone: The zone name
+        zone: The zone name, or a prebuilt ZoneContext
         
     Returns:
         The encoded payload labels, or None if format doesn't match
     """
-    # Convert to string
-    name_str = next_name.to_text().lower()
-    zone = zone.lower().rstrip('.')
-    
-    # Check if it ends with our zone
-    if not name_str.rstrip('.').endswith(zone):
+    ctx = ZoneContext.from_zone(zone)
+    if ctx.zone_labels is None:
         return None
     
-    # Remove zone suffix
-    prefix = name_str.rstrip('.')
-    zone_suffix = '.' + zone
-    if prefix.endswith(zone_suffix):
-        prefix = prefix[:-len(zone_suffix)]
+    # Work on the label tuple dnspython already holds rather than
+    # rendering the name to text and splitting it again
+    labels = next_name.labels
+    if labels and labels[-1] == b'':
+        labels = labels[:-1]
     
-    # Split into labels
-    labels = prefix.split('.')
+    # Need the node label, at least one payload label, and the zone
+    zone_len = len(ctx.zone_labels)
+    split = len(labels) - zone_len
+    if split < 2:
+        return None
+    
+    # Check the name ends with our zone (names keep the case they were
+    # received in, so compare lowercased)
+    if tuple(label.lower() for label in labels[split:]) != ctx.zone_labels:
+        return None
     
     # First label should be nXXXX
-    if not labels or not labels[0].startswith('n'):
+    if labels[0][:1] not in (b'n', b'N'):
         return None
     
     # Remaining labels are the payload
-    if len(labels) < 2:
-        return None
+    payload_labels = b'.'.join(labels[1:split]).lower()
+    return payload_labels.decode('ascii', errors='replace')
+
+
+def extract_payloads(
+    results: Iterable[Tuple[Optional[dns.name.Name], Optional[dns.message.Message]]],
+    zone: Union[str, ZoneContext]
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Extract the next name and payload from each result of a batch query.
+    
+    Args:
+        results: (next_name, response) tuples as returned by batch_query_sync
+            or query_and_extract_nsec_batch
+        zone: The zone name, or a prebuilt ZoneContext
+        
+    Returns:
+        One (next_name_text, payload) tuple per result, in order; either
+        element is None when there was no NSEC or no payload
+    """
+    ctx = ZoneContext.from_zone(zone)
+    extracted: List[Tuple[Optional[str], Optional[str]]] = []
+    
+    for next_name, _ in results:
+        if next_name is None:
+            extracted.append((None, None))
+        else:
+            extracted.append((next_name.to_text(),
+                              extract_payload_from_next_name(next_name, ctx)))
+    return extracted
+
+
+def _configure_resolver(
+    resolver: dns.resolver.Resolver,
+    resolver_ip: str,
+    timeout: float
+) -> None:
+    """Point a stub resolver at resolver_ip and request DNSSEC data."""
+    resolver.nameservers = [resolver_ip]
+    resolver.timeout = timeout
+    resolver.lifetime = timeout
+    
+    # We want DNSSEC data
+    resolver.use_edns(edns=0, ednsflags=dns.flags.DO, payload=4096)
+
+
+# Resolvers built for query_and_extract_nsec callers that don't pass one,
+# keyed by (resolver_ip, timeout)
+_default_resolvers: Dict[Tuple[str, float], dns.resolver.Resolver] = {}
+
+
+def make_resolver(resolver_ip: str, timeout: float = 5.0) -> dns.resolver.Resolver:
+    """
+    Build a resolver that queries resolver_ip with the DO bit set.
+    
+    Construct one and pass it to query_and_extract_nsec for every query
+    in a loop instead of rebuilding the resolver state per call.
     
-    payload_labels = '.'.join(labels[1:])
-    return payload_labels
+    Args:
+        resolver_ip: IP address of the resolver
+        timeout: Query timeout in seconds
+        
+    Returns:
+        A configured dns.resolver.Resolver
+    """
+    resolver = dns.resolver.Resolver(configure=False)
+    _configure_resolver(resolver, resolver_ip, timeout)
+    return resolver
+
+
+def _nxdomain_response(error: dns.resolver.NXDOMAIN) -> dns.message.Message:
+    """Return the response carried by an NXDOMAIN for its (single) query name."""
+    return error.response(error.qnames()[0])
+
+
+def _first_next_name(response: dns.message.Message) -> Optional[dns.name.Name]:
+    """Return the next name of the first NSEC record in a response."""
+    for nsec_rrset in extract_nsec_from_response(response):
+        next_name = extract_next_name(nsec_rrset)
+        if next_name:
+            return next_name
+    return None
 
 
 def query_and_extract_nsec(
     name: str,
     resolver_ip: str,
-    timeout: float = 5.0
+    timeout: float = 5.0,
+    resolver: Optional[dns.resolver.Resolver] = None
 ) -> Tuple[Optional[dns.name.Name], Optional[dns.message.Message]]:
     """
     Query a name and extract the NSEC next-name from the response.
     
-    This is the main function used during priming/verification.
+    Queries one name at a time through a stub resolver; priming and
+    verification send their queries in bulk with batch_query_sync or
+    query_and_extract_nsec_batch instead.
     
     Args:
         name: The name to query (should be an in-gap name)
-        resolver_ip: IP address of the resolver
-        timeout: Query timeout in seconds
+        resolver_ip: IP address of the resolver (ignored if resolver is given)
+        timeout: Query timeout in seconds (ignored if resolver is given)
+        resolver: A resolver from make_resolver to reuse across calls;
+            if omitted, one is built per (resolver_ip, timeout) and cached
         
     Returns:
         Tuple of (next_name, full_response) or (None, response) on failure
     """
-    resolver = dns.resolver.Resolver()
-    resolver.nameservers = [resolver_ip]
-    resolver.timeout = timeout
-    resolver.lifetime = timeout
-    
-    # We want DNSSEC data
-    resolver.use_edns(edns=0, ednsflags=dns.flags.DO, payload=4096)
+    if resolver is None:
+        key = (resolver_ip, timeout)
+        resolver = _default_resolvers.get(key)
+        if resolver is None:
+            resolver = _default_resolvers[key] = make_resolver(resolver_ip, timeout)
     
     try:
         # This will raise NXDOMAIN which we catch
@@ -142,17 +260,8 @@ def query_and_extract_nsec(
         return (None, None)
     except dns.resolver.NXDOMAIN as e:
         # This is expected - we want the NSEC from the NXDOMAIN response
-        response = e.response()
-        
-        # Extract NSEC
-        nsec_rrsets = extract_nsec_from_response(response)
-        
-        for nsec_rrset in nsec_rrsets:
-            next_name = extract_next_name(nsec_rrset)
-            if next_name:
-                return (next_name, response)
-        
-        return (None, response)
+        response = _nxdomain_response(e)
+        return (_first_next_name(response), response)
     except dns.resolver.NoAnswer as e:
         return (None, e.response())
     except Exception as e:
@@ -160,29 +269,265 @@ def query_and_extract_nsec(
         return (None, None)
 
 
+def _result_from_response(
+    name: str,
+    response: dns.message.Message
+) -> Tuple[Optional[dns.name.Name], Optional[dns.message.Message]]:
+    """
+    Interpret a raw response the way query_and_extract_nsec does.
+    
+    NXDOMAIN yields the first NSEC next name, an empty NOERROR yields
+    (None, response), and an answer or error rcode yields (None, None).
+    """
+    rcode = response.rcode()
+    if rcode == dns.rcode.NXDOMAIN:
+        return (_first_next_name(response), response)
+    if rcode == dns.rcode.NOERROR:
+        # An answer means the name exists (unexpected)
+        return (None, None) if response.answer else (None, response)
+    print(f"[!] Query error for {name}: {dns.rcode.to_text(rcode)}")
+    return (None, None)
+
+
+def _check_batch_limits(concurrency: int = 1, retries: int = 0) -> None:
+    """Raise ValueError for a concurrency below 1 or a negative retry count."""
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    if retries < 0:
+        raise ValueError(f"retries must not be negative, got {retries}")
+
+
+async def aquery_nsec_direct(
+    name: str,
+    resolver_ip: str,
+    timeout: float = 5.0,
+    retries: int = 0,
+    port: int = 53
+) -> Tuple[Optional[dns.name.Name], Optional[dns.message.Message]]:
+    """
+    Send one DNSSEC query straight to the resolver and extract the NSEC.
+    
+    Skips the stub-resolver layer (per-query resolution state and
+    exception-based NXDOMAIN handling) and uses a single UDP exchange,
+    retrying over TCP only if the response is truncated.
+    
+    Args:
+        name: The name to query (should be an in-gap name)
+        resolver_ip: IP address of the resolver
+        timeout: Query timeout in seconds
+        retries: How many more times to send the query if it times out or
+            otherwise fails
+        port: UDP/TCP port of the resolver
+        
+    Returns:
+        Tuple of (next_name, full_response) or (None, response) on failure
+        
+    Raises:
+        ValueError: If retries is negative
+    """
+    _check_batch_limits(retries=retries)
+    query = dns.message.make_query(name, 'A', use_edns=0, want_dnssec=True,
+                                   payload=4096)
+    for _ in range(retries + 1):
+        try:
+            response, _ = await dns.asyncquery.udp_with_fallback(
+                query, resolver_ip, timeout=timeout, port=port
+            )
+            break
+        except Exception as e:
+            error = e
+    else:
+        print(f"[!] Query error for {name}: {error}")
+        return (None, None)
+    return _result_from_response(name, response)
+
+
+async def batch_query(
+    names: Iterable[str],
+    resolver_ip: str,
+    timeout: float = 5.0,
+    concurrency: int = 64,
+    retries: int = 0,
+    port: int = 53
+) -> List[Tuple[Optional[dns.name.Name], Optional[dns.message.Message]]]:
+    """
+    Query many names concurrently and extract their NSEC next-names.
+    
+    Total time is roughly one round trip per `concurrency` names rather
+    than one round trip per name. A failed query is retried in its own
+    slot, so retries overlap with the rest of the batch instead of
+    waiting for it to finish.
+    
+    Args:
+        names: Names to query (should be in-gap names)
+        resolver_ip: IP address of the resolver
+        timeout: Per-query timeout in seconds
+        concurrency: Maximum number of queries in flight at once
+        retries: How many more times to send a query that fails
+        port: UDP/TCP port of the resolver
+        
+    Returns:
+        One (next_name, full_response) tuple per name, in input order
+        
+    Raises:
+        ValueError: If concurrency is below 1 or retries is negative
+    """
+    _check_batch_limits(concurrency, retries)
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def query_one(name: str):
+        async with semaphore:
+            return await aquery_nsec_direct(name, resolver_ip, timeout, retries, port)
+    
+    return list(await asyncio.gather(*(query_one(n) for n in names)))
+
+
+def batch_query_sync(
+    names: Iterable[str],
+    resolver_ip: str,
+    timeout: float = 5.0,
+    concurrency: int = 64,
+    retries: int = 0,
+    port: int = 53
+) -> List[Tuple[Optional[dns.name.Name], Optional[dns.message.Message]]]:
+    """
+    Blocking wrapper around batch_query for non-async callers.
+    
+    Args:
+        names: Names to query (should be in-gap names)
+        resolver_ip: IP address of the resolver
+        timeout: Per-query timeout in seconds
+        concurrency: Maximum number of queries in flight at once
+        retries: How many more times to send a query that fails
+        port: UDP/TCP port of the resolver
+        
+    Returns:
+        One (next_name, full_response) tuple per name, in input order
+        
+    Raises:
+        ValueError: If concurrency is below 1 or retries is negative
+    """
+    _check_batch_limits(concurrency, retries)
+    return asyncio.run(batch_query(names, resolver_ip, timeout, concurrency,
+                                   retries, port))
+
+
+def _pipeline_tcp(
+    names: List[str],
+    indices: List[int],
+    resolver_ip: str,
+    timeout: float,
+    results: List[Tuple[Optional[dns.name.Name], Optional[dns.message.Message]]],
+    port: int = 53
+) -> List[int]:
+    """
+    Pipeline the queries for names[indices] over one TCP connection.
+    
+    Fills results in place and returns the indices left unanswered.
+    """
+    unanswered = set(indices)
+    
+    try:
+        sock = socket.create_connection((resolver_ip, port), timeout=timeout)
+    except OSError as e:
+        print(f"[!] Could not connect to {resolver_ip} over TCP: {e}")
+        return indices
+    
+    with sock:
+        # Message IDs are 16 bits, so pipeline at most 65536 queries at a time
+        for start in range(0, len(indices), 0x10000):
+            window = indices[start:start + 0x10000]
+            wires = []
+            for msg_id, index in enumerate(window):
+                query = dns.message.make_query(names[index], 'A', use_edns=0,
+                                               want_dnssec=True, payload=4096)
+                query.id = msg_id
+                wire = query.to_wire()
+                wires.append(len(wire).to_bytes(2, 'big') + wire)
+            
+            try:
+                sock.sendall(b''.join(wires))
+                for _ in window:
+                    response, _ = dns.query.receive_tcp(
+                        sock, expiration=time.time() + timeout
+                    )
+                    if response.id < len(window):
+                        index = window[response.id]
+                        results[index] = _result_from_response(names[index], response)
+                        unanswered.discard(index)
+            except Exception as e:
+                print(f"[!] TCP batch query error: {e}")
+                break
+    
+    return [index for index in indices if index in unanswered]
+
+
+def query_and_extract_nsec_batch(
+    names: Iterable[str],
+    resolver_ip: str,
+    timeout: float = 5.0,
+    retries: int = 0,
+    port: int = 53
+) -> List[Tuple[Optional[dns.name.Name], Optional[dns.message.Message]]]:
+    """
+    Query many names over one persistent TCP connection to the resolver.
+    
+    All queries are written up front (DNS over TCP allows pipelining) and
+    responses, which may arrive in any order, are matched back by message
+    ID. This avoids a socket per query and UDP truncation retries.
+    
+    Args:
+        names: Names to query (should be in-gap names)
+        resolver_ip: IP address of the resolver
+        timeout: Timeout in seconds for connecting and for each response
+        retries: How many times to resend still-unanswered queries on a
+            fresh connection after the connection fails or times out
+        port: TCP port of the resolver
+        
+    Returns:
+        One (next_name, full_response) tuple per name, in input order
+        
+    Raises:
+        ValueError: If retries is negative
+    """
+    _check_batch_limits(retries=retries)
+    names = list(names)
+    results: List[Tuple[Optional[dns.name.Name], Optional[dns.message.Message]]] = \
+        [(None, None)] * len(names)
+    
+    pending = list(range(len(names)))
+    for _ in range(retries + 1):
+        if not pending:
+            break
+        pending = _pipeline_tcp(names, pending, resolver_ip, timeout, results, port)
+    
+    return results
+
+
 def get_nsec_proof_info(
     response: dns.message.Message,
-    zone: str
+    zone: Union[str, ZoneContext]
 ) -> List[dict]:
     """
     Extract detailed NSEC proof information from a response.
     
     Args:
         response: DNS response message
-        zone: Zone name
+        zone: Zone name, or a prebuilt ZoneContext
         
     Returns:
         List of dicts with NSEC proof details
     """
     proofs = []
     nsec_rrsets = extract_nsec_from_response(response)
+    zone_ctx = ZoneContext.from_zone(zone)
     
     for rrset in nsec_rrsets:
         owner = rrset.name.to_text()
         next_name = extract_next_name(rrset)
         
         if next_name:
-            payload = extract_payload_from_next_name(next_name, zone)
+            payload = extract_payload_from_next_name(next_name, zone_ctx)
             proofs.append({
                 'owner': owner,
                 'next': next_name.to_text(),
@@ -14,50 +14,32 @@ This script:
 """
 
 import argparse
-import json
 import os
 import sys
-import time
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from nsecchain.ordering import in_gap_name, parse_node_name
-from nsecchain.decoder import decode_labels, strip_padding
-from nsecchain.parser import query_and_extract_nsec, extract_payload_from_next_name
-
-
-def count_auth_queries(log_path: str) -> int:
-    """
-    Count the number of queries in the authoritative server log.
-    
-    Args:
-        log_path: Path to the auth query log file
-        
-    Returns:
-        Number of query lines found
-    """
-    try:
-        if not os.path.exists(log_path):
-            return 0
-        with open(log_path, 'r') as f:
-            lines = f.readlines()
-        # Count lines that contain query information
-        # BIND9 query log format: "client @... (name): query: name IN type"
-        query_count = sum(1 for line in lines if 'query:' in line.lower())
-        return query_count
-    except Exception as e:
-        print(f"[!] Warning: Could not read auth log: {e}")
-        return 0
+from nsecchain.ordering import extract_index_from_name, in_gap_names
+from nsecchain.decoder import decode_payload
+from nsecchain.common import (
+    count_auth_queries,
+    non_negative_float,
+    non_negative_int,
+    positive_int,
+    wait_for_log_flush,
+    write_results,
+)
 
 
 def prime_nsec_chain(
     zone: str,
     resolver_ip: str,
     num_nodes: int,
-    timeout: float = 5.0
+    timeout: float = 5.0,
+    quiet: bool = False,
+    tcp: bool = False,
+    max_concurrent: int = 64,
+    max_retries: int = 2
 ) -> Tuple[List[str], List[dict]]:
     """
     Prime the recursive resolver cache by walking the NSEC chain.
@@ -67,12 +49,26 @@ def prime_nsec_chain(
         resolver_ip: IP of the recursive resolver
         num_nodes: Expected number of payload nodes
         timeout: Query timeout
+        quiet: Skip the per-query progress lines
+        tcp: Pipeline all queries over one TCP connection instead of UDP
+        max_concurrent: Maximum number of UDP queries in flight at once
+        max_retries: How many more times to send a query that fails
         
     Returns:
         Tuple of (payload_chunks, query_details)
     """
-    payload_chunks: List[str] = []
-    query_details: List[dict] = []
+    # dnspython is only needed once queries are sent; keep it out of
+    # the import path for --help and argument errors
+    from nsecchain.parser import (
+        batch_query_sync,
+        extract_payloads,
+        query_and_extract_nsec_batch,
+    )
+    
+    # Slots are filled by query index, so results can be assigned in
+    # whatever order they are processed
+    payload_by_index: List[Optional[str]] = [None] * num_nodes
+    query_details: List[Optional[dict]] = [None] * num_nodes
     
     print(f"\n{'='*60}")
     print("PRIMING PHASE - Walking NSEC Chain")
@@ -82,14 +78,23 @@ def prime_nsec_chain(
     print(f"Expected nodes: {num_nodes}")
     print()
     
-    for i in range(num_nodes):
-        # Generate in-gap name for priming (using 'z' suffix)
-        gap_name = in_gap_name(i, zone, suffix='z')
-        
-        print(f"[{i+1}/{num_nodes}] Querying: {gap_name}")
-        
-        # Query and extract NSEC
-        next_name, response = query_and_extract_nsec(gap_name, resolver_ip, timeout)
+    # Generate in-gap names for priming (using 'z' suffix) and send
+    # all queries concurrently
+    gap_names = in_gap_names(num_nodes, zone, suffix='z')
+    if tcp:
+        results = query_and_extract_nsec_batch(gap_names, resolver_ip, timeout,
+                                               retries=max_retries)
+    else:
+        results = batch_query_sync(gap_names, resolver_ip, timeout,
+                                   concurrency=max_concurrent, retries=max_retries)
+    extracted = extract_payloads(results, zone)
+    
+    # Progress lines are collected and written in one call after the loop
+    lines: List[str] = []
+    
+    for i, (gap_name, (next_name_str, payload)) in enumerate(zip(gap_names, extracted)):
+        if not quiet:
+            lines.append(f"[{i+1}/{num_nodes}] Queried: {gap_name}")
         
         detail = {
             'index': i,
@@ -99,65 +104,35 @@ def prime_nsec_chain(
             'payload': None
         }
         
-        if next_name:
-            next_name_str = next_name.to_text()
+        if next_name_str:
             detail['next_name'] = next_name_str
             detail['success'] = True
             
-            # Extract payload from next name
-            payload = extract_payload_from_next_name(next_name, zone)
-            
             if payload:
                 detail['payload'] = payload
-                payload_chunks.append(payload)
+                payload_by_index[i] = payload
                 
-                # Parse the next name to show index
-                parsed = parse_node_name(next_name_str, zone)
-                if parsed:
-                    next_idx, _ = parsed
-                    print(f"    -> NSEC next: {next_name_str}")
-                    print(f"    -> Reveals node n{next_idx:04d} with payload: {payload}")
-                else:
-                    print(f"    -> NSEC next: {next_name_str} (end marker)")
-            else:
-                print(f"    -> NSEC next: {next_name_str} (no payload - likely end marker)")
-        else:
-            print(f"    -> No NSEC found in response")
-        
-        query_details.append(detail)
+                # The payload already matched the zone, so only the index
+                # label is left to parse
+                next_idx = None if quiet else extract_index_from_name(next_name_str)
+                if next_idx is not None:
+                    lines.append(f"    -> NSEC next: {next_name_str}")
+                    lines.append(f"    -> Reveals node n{next_idx:04d} with payload: {payload}")
+                elif not quiet:
+                    lines.append(f"    -> NSEC next: {next_name_str} (end marker)")
+            elif not quiet:
+                lines.append(f"    -> NSEC next: {next_name_str} (no payload - likely end marker)")
+        elif not quiet:
+            lines.append(f"    -> No NSEC found in response")
         
-        # Small delay to ensure proper logging
-        time.sleep(0.1)
+        query_details[i] = detail
     
-    return payload_chunks, query_details
-
-
-def decode_payload(chunks: List[str]) -> str:
-    """
-    Decode payload chunks back to original message.
-    
-    Args:
-        chunks: List of base32 encoded payload strings
-        
-    Returns:
-        Decoded message string
-    """
-    decoded_bytes = b''
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
     
-    for chunk in chunks:
-        try:
-            decoded = decode_labels(chunk)
-            decoded_bytes += decoded
-        except Exception as e:
-            print(f"[!] Warning: Failed to decode chunk '{chunk}': {e}")
-    
-    # Strip padding
-    decoded_bytes = strip_padding(decoded_bytes)
-    
-    try:
-        return decoded_bytes.decode('utf-8')
-    except UnicodeDecodeError:
-        return decoded_bytes.decode('utf-8', errors='replace')
+    payload_chunks = [p for p in payload_by_index if p is not None]
+    return payload_chunks, query_details
 
 
 def main():
@@ -196,6 +171,40 @@ def main():
         default=5.0,
         help='Query timeout in seconds'
     )
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Only print the summary, not a line per query'
+    )
+    parser.add_argument(
+        '--tcp',
+        action='store_true',
+        help='Send all queries over one persistent TCP connection'
+    )
+    parser.add_argument(
+        '--max-concurrent',
+        type=positive_int,
+        default=64,
+        help='Maximum number of UDP queries in flight at once'
+    )
+    parser.add_argument(
+        '--max-retries',
+        type=non_negative_int,
+        default=2,
+        help='How many more times to send a query that fails'
+    )
+    parser.add_argument(
+        '--log-settle',
+        type=non_negative_float,
+        default=0.3,
+        help='Seconds the auth log must stop growing before the final count'
+    )
+    parser.add_argument(
+        '--log-max-wait',
+        type=non_negative_float,
+        default=2.0,
+        help='Longest wait in seconds for the auth log to settle'
+    )
     
     args = parser.parse_args()
     
@@ -223,11 +232,16 @@ def main():
         zone=args.zone,
         resolver_ip=args.resolver,
         num_nodes=num_nodes,
-        timeout=args.timeout
+        timeout=args.timeout,
+        quiet=args.quiet,
+        tcp=args.tcp,
+        max_concurrent=args.max_concurrent,
+        max_retries=args.max_retries
     )
     
-    # Small delay for log flush
-    time.sleep(0.5)
+    # Let the auth server finish writing its query log
+    wait_for_log_flush(args.auth_log, settle=args.log_settle,
+                       max_wait=args.log_max_wait)
     
     # Count auth queries after priming
     auth_queries_after = count_auth_queries(args.auth_log)
@@ -262,9 +276,7 @@ def main():
         'query_details': query_details
     }
     
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(results, indent=2))
+    write_results(Path(args.output), results)
     print(f"\n[+] Results saved to: {args.output}")
     
     return 0
@@ -10,65 +10,92 @@ Produces a human-friendly summary of the demo results, showing:
 """
 
 import argparse
-import json
 import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+from nsecchain.common import read_results
+
+
+def _read_if_present(path: str) -> Optional[dict]:
+    """Read a results file, or return None if it does not exist."""
+    try:
+        return read_results(Path(path))
+    except FileNotFoundError:
+        return None
 
 
 def load_results(prime_path: str, verify_path: str) -> tuple:
     """Load priming and verification results."""
-    prime_results = None
-    verify_results = None
-    
-    if Path(prime_path).exists():
-        prime_results = json.loads(Path(prime_path).read_text())
-    
-    if Path(verify_path).exists():
-        verify_results = json.loads(Path(verify_path).read_text())
-    
-    return prime_results, verify_results
+    return _read_if_present(prime_path), _read_if_present(verify_path)
+
+
+_WIDTH = 70
+_RULE = "=" * _WIDTH
+_SECTION_RULE = "-" * 40
+_TITLE = "NSEC CACHE DATASTORE DEMO REPORT".center(_WIDTH)
+_VERDICT_HEADER = [_RULE, "VERDICT".center(_WIDTH), _RULE, ""]
+_FOOTER = ["", _RULE, "END OF REPORT".center(_WIDTH), _RULE]
+
+_SUCCESS_BOX = [
+    "  ╔════════════════════════════════════════════════════════════╗",
+    "  ║                        SUCCESS                             ║",
+    "  ╠════════════════════════════════════════════════════════════╣",
+    "  ║  RFC 8198 aggressive negative caching CONFIRMED            ║",
+    "  ║                                                            ║",
+    "  ║  The recursive resolver served NXDOMAIN responses with     ║",
+    "  ║  NSEC proofs for UNSEEN names using only cached data.      ║",
+    "  ║                                                            ║",
+    "  ║  Δ = 0: No new queries to authoritative during verify.     ║",
+    "  ╚════════════════════════════════════════════════════════════╝",
+]
+
+# The failure box has one dynamic line (the delta) between these parts
+_FAILURE_BOX_TOP = [
+    "  ╔════════════════════════════════════════════════════════════╗",
+    "  ║                     UNEXPECTED RESULT                      ║",
+    "  ╠════════════════════════════════════════════════════════════╣",
+]
+_FAILURE_BOX_BOTTOM = [
+    "  ║                                                            ║",
+    "  ║  Possible causes:                                          ║",
+    "  ║  - NSEC cache TTL expired between prime and verify         ║",
+    "  ║  - aggressive-nsec not enabled in Unbound                  ║",
+    "  ║  - DNSSEC validation failed                                ║",
+    "  ╚════════════════════════════════════════════════════════════╝",
+]
 
 
 def generate_report(prime_results: dict, verify_results: dict) -> str:
     """Generate the demo report."""
     
-    width = 70
-    
-    lines = []
-    lines.append("=" * width)
-    lines.append("NSEC CACHE DATASTORE DEMO REPORT".center(width))
-    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".center(width))
-    lines.append("=" * width)
-    lines.append("")
+    generated = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    lines = [_RULE, _TITLE, generated.center(_WIDTH), _RULE, ""]
     
     # Configuration
     if prime_results:
-        lines.append("CONFIGURATION")
-        lines.append("-" * 40)
-        lines.append(f"  Zone:              {prime_results.get('zone', 'unknown')}")
-        lines.append(f"  Resolver:          {prime_results.get('resolver', 'unknown')}")
-        lines.append(f"  Payload nodes:     {prime_results.get('num_nodes', 'unknown')}")
-        lines.append("")
+        lines += [
+            "CONFIGURATION",
+            _SECTION_RULE,
+            f"  Zone:              {prime_results.get('zone', 'unknown')}",
+            f"  Resolver:          {prime_results.get('resolver', 'unknown')}",
+            f"  Payload nodes:     {prime_results.get('num_nodes', 'unknown')}",
+            "",
+        ]
     
     # Payload
-    lines.append("DECODED PAYLOAD")
-    lines.append("-" * 40)
+    lines += ["DECODED PAYLOAD", _SECTION_RULE]
     
     if prime_results and prime_results.get('decoded_payload'):
-        payload = prime_results['decoded_payload']
-        lines.append(f"  From priming:      \"{payload}\"")
+        lines.append(f"  From priming:      \"{prime_results['decoded_payload']}\"")
     
     if verify_results and verify_results.get('decoded_payload'):
-        payload = verify_results['decoded_payload']
-        lines.append(f"  From verification: \"{payload}\"")
-    
-    lines.append("")
+        lines.append(f"  From verification: \"{verify_results['decoded_payload']}\"")
     
     # Priming Statistics
-    lines.append("PRIMING PHASE")
-    lines.append("-" * 40)
+    lines += ["", "PRIMING PHASE", _SECTION_RULE]
     
     if prime_results:
         chunks = len(prime_results.get('payload_chunks', []))
@@ -76,20 +103,19 @@ def generate_report(prime_results: dict, verify_results: dict) -> str:
         auth_after = prime_results.get('auth_queries_after', 0)
         priming_queries = prime_results.get('priming_queries', auth_after - auth_before)
         
-        lines.append(f"  Payload chunks extracted:    {chunks}")
-        lines.append(f"  Auth queries (before):       {auth_before}")
-        lines.append(f"  Auth queries (after):        {auth_after}")
-        lines.append(f"  New auth queries:            {priming_queries}")
-        lines.append("")
-        lines.append("  [Expected: Priming SHOULD contact authoritative to fill cache]")
+        lines += [
+            f"  Payload chunks extracted:    {chunks}",
+            f"  Auth queries (before):       {auth_before}",
+            f"  Auth queries (after):        {auth_after}",
+            f"  New auth queries:            {priming_queries}",
+            "",
+            "  [Expected: Priming SHOULD contact authoritative to fill cache]",
+        ]
     else:
         lines.append("  [No priming results available]")
     
-    lines.append("")
-    
     # Verification Statistics
-    lines.append("VERIFICATION PHASE")
-    lines.append("-" * 40)
+    lines += ["", "VERIFICATION PHASE", _SECTION_RULE]
     
     if verify_results:
         synthesis = verify_results.get('synthesis_count', 0)
@@ -98,56 +124,34 @@ def generate_report(prime_results: dict, verify_results: dict) -> str:
         auth_after = verify_results.get('auth_queries_after', 0)
         delta = verify_results.get('delta', auth_after - auth_before)
         
-        lines.append(f"  Successful cache hits:       {synthesis}/{total}")
-        lines.append(f"  Auth queries (before):       {auth_before}")
-        lines.append(f"  Auth queries (after):        {auth_after}")
-        lines.append(f"  New auth queries (Δ):        {delta}")
-        lines.append("")
-        lines.append("  [Expected: Verification should NOT contact authoritative (Δ=0)]")
+        lines += [
+            f"  Successful cache hits:       {synthesis}/{total}",
+            f"  Auth queries (before):       {auth_before}",
+            f"  Auth queries (after):        {auth_after}",
+            f"  New auth queries (Δ):        {delta}",
+            "",
+            "  [Expected: Verification should NOT contact authoritative (Δ=0)]",
+        ]
     else:
         lines.append("  [No verification results available]")
     
-    lines.append("")
-    
     # Verdict
-    lines.append("=" * width)
-    lines.append("VERDICT".center(width))
-    lines.append("=" * width)
     lines.append("")
+    lines += _VERDICT_HEADER
     
     if verify_results:
         delta = verify_results.get('delta', -1)
-        verdict = verify_results.get('verdict', 'UNKNOWN')
         
         if delta == 0:
-            lines.append("  ╔════════════════════════════════════════════════════════════╗")
-            lines.append("  ║                        SUCCESS                             ║")
-            lines.append("  ╠════════════════════════════════════════════════════════════╣")
-            lines.append("  ║  RFC 8198 aggressive negative caching CONFIRMED            ║")
-            lines.append("  ║                                                            ║")
-            lines.append("  ║  The recursive resolver served NXDOMAIN responses with     ║")
-            lines.append("  ║  NSEC proofs for UNSEEN names using only cached data.      ║")
-            lines.append("  ║                                                            ║")
-            lines.append("  ║  Δ = 0: No new queries to authoritative during verify.     ║")
-            lines.append("  ╚════════════════════════════════════════════════════════════╝")
+            lines += _SUCCESS_BOX
         else:
-            lines.append("  ╔════════════════════════════════════════════════════════════╗")
-            lines.append("  ║                     UNEXPECTED RESULT                      ║")
-            lines.append("  ╠════════════════════════════════════════════════════════════╣")
+            lines += _FAILURE_BOX_TOP
             lines.append(f"  ║  Δ = {delta}: Authoritative was contacted during verify".ljust(62) + "║")
-            lines.append("  ║                                                            ║")
-            lines.append("  ║  Possible causes:                                          ║")
-            lines.append("  ║  - NSEC cache TTL expired between prime and verify         ║")
-            lines.append("  ║  - aggressive-nsec not enabled in Unbound                  ║")
-            lines.append("  ║  - DNSSEC validation failed                                ║")
-            lines.append("  ╚════════════════════════════════════════════════════════════╝")
+            lines += _FAILURE_BOX_BOTTOM
     else:
         lines.append("  [Cannot determine verdict - verification results missing]")
     
-    lines.append("")
-    lines.append("=" * width)
-    lines.append("END OF REPORT".center(width))
-    lines.append("=" * width)
+    lines += _FOOTER
     
     return "\n".join(lines)
 
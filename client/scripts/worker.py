@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Line-protocol worker used by the integration tests.
+
+Started once per test session inside the client container with
+'docker exec -i nsec-client python3 /app/scripts/worker.py', it reads
+one command per line on stdin and answers each with one JSON line on
+stdout. The tests then pay for container entry and interpreter startup
+once, instead of once per check.
+
+Commands:
+    ping    Resolve ns1.zone.test. through the recursor
+    prime   Run prime.py and return its results file
+    verify  Run verify_synthesis.py and return its results file
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+from pathlib import Path
+
+from nsecchain.common import read_results
+
+
+def _ping() -> dict:
+    """Check that the recursor answers for the zone."""
+    import dns.resolver
+    
+    r = dns.resolver.Resolver()
+    r.nameservers = [os.environ.get('RESOLVER_IP', '172.28.0.3')]
+    r.lifetime = 2
+    try:
+        r.resolve('ns1.zone.test.', 'A')
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
+    return {'ok': True}
+
+
+def _run_script(module_name: str, results_path: str) -> dict:
+    """
+    Run a script's main() in this process and read back its results.
+    
+    The script's own output is captured and returned with the reply so
+    it cannot interleave with the protocol on stdout.
+    
+    Args:
+        module_name: Script module in this directory ('prime', ...)
+        results_path: Results file the script writes by default
+        
+    Returns:
+        Reply with 'returncode', 'results' (None if the file is missing)
+        and the captured 'output'
+    """
+    module = __import__(module_name)
+    output = io.StringIO()
+    argv = sys.argv
+    sys.argv = [module.__file__]
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                returncode = module.main() or 0
+            except SystemExit as e:
+                returncode = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                print(f"[!] {module_name} failed: {e}")
+                returncode = 1
+    finally:
+        sys.argv = argv
+    
+    try:
+        results = read_results(Path(results_path))
+    except (OSError, ValueError):
+        results = None
+    
+    return {'returncode': returncode, 'results': results,
+            'output': output.getvalue()}
+
+
+_COMMANDS = {
+    'ping': _ping,
+    'prime': lambda: _run_script('prime', '/results/prime_results.json'),
+    'verify': lambda: _run_script('verify_synthesis', '/results/verify_results.json'),
+}
+
+
+def main():
+    out = sys.stdout
+    for line in sys.stdin:
+        command = line.strip()
+        if not command:
+            continue
+        handler = _COMMANDS.get(command)
+        if handler is None:
+            reply = {'error': f"unknown command: {command}"}
+        else:
+            reply = handler()
+        out.write(json.dumps(reply) + '\n')
+        out.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Unit tests for the scripts' shared helpers.
+
+Tests auth query counting across appends, partial lines, log rotation
+and truncation, waiting for the log to settle, and results files.
+"""
+
+import argparse
+import mmap
+import os
+import threading
+import time
+
+import pytest
+
+import nsecchain.common as _common
+from nsecchain.common import (
+    count_auth_queries,
+    non_negative_float,
+    read_results,
+    wait_for_log_flush,
+    write_results,
+    _count_markers,
+)
+
+
+LINE = b'client @0x1 172.28.0.2#5353 (n0000z.zone.test): query: n0000z.zone.test IN A\n'
+
+
+@pytest.fixture
+def log_path(tmp_path, monkeypatch):
+    """A fresh query log path with no saved checkpoints."""
+    monkeypatch.setattr(_common, '_log_checkpoints', {})
+    return str(tmp_path / 'query.log')
+
+
+def append(path: str, data: bytes) -> None:
+    """Append raw bytes to a log file."""
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+class TestCountAuthQueries:
+    """Tests for count_auth_queries."""
+    
+    def test_missing_log(self, log_path):
+        """A log that does not exist yet counts as zero."""
+        assert count_auth_queries(log_path) == 0
+    
+    def test_resumes_from_checkpoint(self, log_path):
+        """Later calls only scan what was appended, and keep the total."""
+        append(log_path, LINE * 3)
+        assert count_auth_queries(log_path) == 3
+        assert _common._log_checkpoints[log_path][1:] == (len(LINE) * 3, 3)
+        
+        append(log_path, LINE * 2)
+        assert count_auth_queries(log_path) == 5
+        assert count_auth_queries(log_path) == 5
+    
+    def test_partial_line_counted_once(self, log_path):
+        """A half-written last line is counted but not checkpointed."""
+        append(log_path, LINE + LINE[:40])
+        assert count_auth_queries(log_path) == 1
+        
+        append(log_path, LINE[40:-1])
+        assert count_auth_queries(log_path) == 2
+        assert _common._log_checkpoints[log_path][1] == len(LINE)
+        
+        append(log_path, b'\n' + LINE)
+        assert count_auth_queries(log_path) == 3
+        assert _common._log_checkpoints[log_path][1] == len(LINE) * 3
+    
+    def test_rotation_counts_rotated_tail(self, log_path):
+        """Lines written before rotation but after the last call are kept."""
+        append(log_path, LINE * 2)
+        assert count_auth_queries(log_path) == 2
+        
+        # More lines land in the old file, then BIND renames it to .0
+        append(log_path, LINE * 3)
+        os.rename(log_path, log_path + '.0')
+        append(log_path, LINE * 4)
+        
+        assert count_auth_queries(log_path) == 9
+        append(log_path, LINE)
+        assert count_auth_queries(log_path) == 10
+    
+    def test_rotated_twice(self, log_path):
+        """If <log>.0 is no longer the file we read, only the new log counts."""
+        append(log_path, LINE * 2)
+        assert count_auth_queries(log_path) == 2
+        
+        # Two rotations between calls: our file is now <log>.1
+        os.rename(log_path, log_path + '.1')
+        append(log_path + '.0', LINE * 7)
+        append(log_path, LINE * 3)
+        assert count_auth_queries(log_path) == 5
+    
+    def test_truncation_restarts_count(self, log_path):
+        """A log truncated below the checkpoint is counted from scratch."""
+        append(log_path, LINE * 5)
+        assert count_auth_queries(log_path) == 5
+        
+        with open(log_path, 'wb') as f:
+            f.write(LINE)
+        assert count_auth_queries(log_path) == 1
+        
+        append(log_path, LINE)
+        assert count_auth_queries(log_path) == 2
+    
+    def test_empty_after_truncation(self, log_path):
+        """A log truncated to nothing counts zero and resumes from there."""
+        append(log_path, LINE * 2)
+        assert count_auth_queries(log_path) == 2
+        
+        open(log_path, 'wb').close()
+        assert count_auth_queries(log_path) == 0
+        
+        append(log_path, LINE)
+        assert count_auth_queries(log_path) == 1
+
+
+class TestCountMarkers:
+    """Markers that straddle a scan block boundary are counted once."""
+    
+    @pytest.mark.parametrize('offset', range(-6, 2))
+    def test_marker_across_block_boundary(self, log_path, offset):
+        """Place a marker at every position around a real 1 MiB boundary."""
+        block = _common._SCAN_BLOCK
+        data = bytearray(b'x' * (block + 64))
+        data[block + offset:block + offset + 6] = b'query:'
+        append(log_path, bytes(data) + b'\n')
+        assert count_auth_queries(log_path) == 1
+    
+    def test_small_blocks(self, log_path, monkeypatch):
+        """With tiny blocks every boundary position is exercised."""
+        monkeypatch.setattr(_common, '_SCAN_BLOCK', 7)
+        append(log_path, LINE * 20)
+        assert count_auth_queries(log_path) == 20
+    
+    def test_range_limits(self):
+        """Only markers wholly inside [start, end) are counted."""
+        data = b'query:query:query:'
+        with mmap.mmap(-1, len(data)) as mm:
+            mm.write(data)
+            assert _count_markers(mm, 0, len(data)) == 3
+            assert _count_markers(mm, 1, len(data)) == 2
+            assert _count_markers(mm, 0, len(data) - 1) == 2
+
+
+class TestWaitForLogFlush:
+    """Tests for the log-flush barrier before the final count."""
+    
+    def test_missing_log(self, log_path):
+        """A missing log returns without waiting."""
+        start = time.monotonic()
+        wait_for_log_flush(log_path, settle=1.0, max_wait=5.0)
+        assert time.monotonic() - start < 0.5
+    
+    def test_late_write_is_waited_for(self, log_path):
+        """A write within the settle window restarts the wait."""
+        append(log_path, LINE)
+        timer = threading.Timer(0.1, append, (log_path, LINE))
+        timer.start()
+        try:
+            wait_for_log_flush(log_path, settle=0.3, max_wait=5.0, interval=0.02)
+        finally:
+            timer.join()
+        assert count_auth_queries(log_path) == 2
+    
+    def test_bounded_by_max_wait(self, log_path):
+        """A log that keeps growing stops the wait after max_wait."""
+        append(log_path, LINE)
+        stop = threading.Event()
+        
+        def grow():
+            while not stop.wait(0.01):
+                append(log_path, LINE)
+        
+        writer = threading.Thread(target=grow)
+        writer.start()
+        try:
+            start = time.monotonic()
+            wait_for_log_flush(log_path, settle=0.2, max_wait=0.3, interval=0.02)
+            elapsed = time.monotonic() - start
+        finally:
+            stop.set()
+            writer.join()
+        assert 0.3 <= elapsed < 1.0
+    
+    @pytest.mark.parametrize('value', ['-0.1', 'nan', 'soon'])
+    def test_rejects_bad_durations(self, value):
+        """Negative and non-numeric durations are argparse errors."""
+        with pytest.raises((argparse.ArgumentTypeError, ValueError)):
+            non_negative_float(value)
+
+
+class TestResultsFiles:
+    """Tests for writing and reading results files."""
+    
+    RESULTS = {'message': 'héllo ✓', 'nodes': 5, 'ratio': 0.25,
+               'queries': [1, 2, 3], 'missing': None}
+    
+    def test_round_trip(self, tmp_path):
+        """Results read back equal to what was written."""
+        path = tmp_path / 'out' / 'results.json'
+        write_results(path, self.RESULTS)
+        assert read_results(path) == self.RESULTS
+    
+    def test_stdlib_fallback_matches(self, tmp_path, monkeypatch):
+        """Without orjson the file is the same, non-ASCII text included."""
+        pytest.importorskip('orjson')
+        fast = tmp_path / 'fast.json'
+        write_results(fast, self.RESULTS)
+        
+        monkeypatch.setattr(_common, 'orjson', None)
+        slow = tmp_path / 'slow.json'
+        write_results(slow, self.RESULTS)
+        
+        assert slow.read_bytes() == fast.read_bytes()
+        assert 'héllo ✓'.encode('utf-8') in slow.read_bytes()
+        assert read_results(slow) == self.RESULTS
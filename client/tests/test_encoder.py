@@ -4,20 +4,24 @@ Unit tests for the encoder module.
 Tests base32 encoding, label splitting, and message chunking.
 """
 
+import base64
 import pytest
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from nsecchain.encoder import (
     encode_chunk,
     split_into_labels,
     chunk_message,
-    encode_message
+    encode_message,
+    encode_message_bulk
+)
+from nsecchain.decoder import (
+    decode_labels,
+    decode_chunk,
+    decode_labels_bulk,
+    decode_payload_chunks,
+    decode_payload,
+    strip_padding
 )
-from nsecchain.decoder import decode_labels, decode_chunk, strip_padding
 
 
 class TestEncodeChunk:
@@ -44,13 +48,30 @@ class TestEncodeChunk:
         result = encode_chunk(b'')
         assert result == ''
     
-    def test_various_lengths(self):
+    @pytest.mark.parametrize('data', [b'hello___', b'\x00' * 8, b'\xff' * 8, bytes(range(8))])
+    def test_eight_byte_chunks(self, data):
+        """The 8-byte fast path matches the generic base32 encoding."""
+        expected = base64.b32encode(data).decode('ascii').rstrip('=').lower()
+        assert encode_chunk(data) == expected
+    
+    @pytest.mark.parametrize('encoding, stdlib_encode', [
+        ('base32', base64.b32encode),
+        ('base32hex', base64.b32hexencode),
+    ])
+    @pytest.mark.parametrize('length', range(0, 140))
+    def test_matches_base64_all_lengths(self, length, encoding, stdlib_encode):
+        """Every input length, on both sides of the integer path limit, matches base64."""
+        data = bytes((i * 37 + length) & 0xff for i in range(length))
+        expected = stdlib_encode(data).decode('ascii').rstrip('=').lower()
+        assert encode_chunk(data, encoding=encoding) == expected
+    
+    @pytest.mark.parametrize('length', [1, 2, 3, 4, 5, 6, 7, 8, 16, 32])
+    def test_various_lengths(self, length):
         """Test encoding various byte lengths."""
-        for length in [1, 2, 3, 4, 5, 6, 7, 8, 16, 32]:
-            data = b'x' * length
-            result = encode_chunk(data)
-            assert result  # Non-empty result
-            assert result.isalnum()
+        data = b'x' * length
+        result = encode_chunk(data)
+        assert result  # Non-empty result
+        assert result.isalnum()
 
 
 class TestSplitIntoLabels:
@@ -134,14 +155,14 @@ class TestRoundTrip:
         decoded = decode_chunk(encoded)
         assert decoded == original
     
-    def test_roundtrip_various_lengths(self):
+    @pytest.mark.parametrize('length', [1, 2, 3, 4, 5, 8, 16, 32])
+    def test_roundtrip_various_lengths(self, length):
         """Round trip with various data lengths."""
-        for length in [1, 2, 3, 4, 5, 8, 16, 32]:
-            original = bytes(range(length % 256)) * (length // 256 + 1)
-            original = original[:length]
-            encoded = encode_chunk(original)
-            decoded = decode_chunk(encoded)
-            assert decoded == original
+        original = bytes(range(length % 256)) * (length // 256 + 1)
+        original = original[:length]
+        encoded = encode_chunk(original)
+        decoded = decode_chunk(encoded)
+        assert decoded == original
     
     def test_roundtrip_with_padding(self):
         """Round trip with underscore padding."""
@@ -153,6 +174,70 @@ class TestRoundTrip:
         # After strip_padding
         stripped = strip_padding(decoded)
         assert stripped == b'hello'
+    
+    def test_decode_multi_label_uppercase(self):
+        """Decoding ignores dots and case."""
+        assert decode_labels('NBSW.Y3DP') == b'hello'
+    
+    @pytest.mark.parametrize('bad', ['nbswy3d1', 'nbs_y3dp', 'nbswy3', 'a'])
+    def test_decode_rejects_invalid_input(self, bad):
+        """Non-base32 characters and impossible lengths raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_labels(bad)
+    
+    @pytest.mark.parametrize('padded', ['nbswy3dp', 'nbswy===', 'nbswy=', 'ab======',
+                                        'ab=', 'nbsw.y3dp'])
+    def test_decode_accepts_trailing_padding(self, padded):
+        """Trailing '=' padding decodes like base64.b32decode does."""
+        clean = padded.replace('.', '').upper()
+        expected = base64.b32decode(clean + '=' * ((-len(clean)) % 8))
+        assert decode_labels(padded) == expected
+    
+    @pytest.mark.parametrize('bad', ['=', 'ab=cd', 'nbswy3dp=', 'nbswy3dp========',
+                                     'nbs====='])
+    def test_decode_rejects_misplaced_padding(self, bad):
+        """'=' inside the data, or beyond the last quantum, is rejected."""
+        with pytest.raises(ValueError):
+            decode_labels(bad)
+
+
+class TestDecodeLabelsBulk:
+    """Tests for bulk decoding of multiple chunks."""
+    
+    def test_aligned_chunks(self):
+        """Chunks of a multiple of 5 bytes decode as one stream."""
+        chunks = encode_message_bulk(b'hello from nsec', 5)
+        assert decode_labels_bulk(chunks) == b'hello from nsec'
+    
+    def test_padded_chunks(self):
+        """Padded chunks decode one by one rather than as one stream."""
+        assert decode_labels_bulk(['nbswy3dp', 'nbsw====', 'ab']) == \
+            decode_labels('nbswy3dp') + decode_labels('nbsw') + decode_labels('ab')
+    
+    def test_unaligned_chunks(self):
+        """Chunks that are not 40-bit aligned are decoded separately."""
+        chunks = encode_message('hello from nsec cache datastore', chunk_size=8)
+        assert decode_payload_chunks(chunks) == b'hello from nsec cache datastore'
+    
+    def test_empty_list(self):
+        """No chunks decode to empty bytes."""
+        assert decode_labels_bulk([]) == b''
+
+
+class TestDecodePayload:
+    """Tests for decoding collected payload chunks to text."""
+    
+    def test_round_trip(self):
+        """Encoded chunks decode back to the original message."""
+        chunks = encode_message('hello from nsec cache datastore', chunk_size=8)
+        assert decode_payload(chunks) == 'hello from nsec cache datastore'
+    
+    def test_bad_chunk_skipped(self, capsys):
+        """Undecodable chunks are reported and skipped."""
+        chunks = encode_message('hello world!', chunk_size=8)
+        chunks.insert(1, 'not-base32')
+        assert decode_payload(chunks) == 'hello world!'
+        assert 'not-base32' in capsys.readouterr().out
 
 
 class TestEncodeMessage:
@@ -163,7 +248,62 @@ class TestEncodeMessage:
         result = encode_message('hello', chunk_size=8)
         assert len(result) == 1
     
+    def test_encode_bytes_message(self):
+        """Bytes messages are encoded without a UTF-8 round trip."""
+        data = bytes(range(256))
+        assert encode_message(data, chunk_size=8) == \
+            [encode_chunk(c) for c in chunk_message(data, 8)]
+        assert encode_message('héllo') == encode_message('héllo'.encode('utf-8'))
+    
     def test_encode_long_message(self):
         """Encode a longer message."""
         result = encode_message('hello from nsec cache datastore', chunk_size=8)
         assert len(result) == 5  # 34 bytes / 8 = 4.25 -> 5 chunks
+
+
+class TestEncodeMessageBulk:
+    """Tests for encode_message_bulk function."""
+    
+    @pytest.mark.parametrize('chunk_size', [3, 5, 8, 10, 15])
+    def test_matches_per_chunk_encoding(self, chunk_size):
+        """Bulk encoding matches encoding each chunk individually."""
+        message = b'hello from nsec cache datastore'
+        expected = [encode_chunk(c) for c in chunk_message(message, chunk_size)]
+        assert encode_message_bulk(message, chunk_size) == expected
+    
+    def test_empty_message(self):
+        """Empty message produces a single padding-only chunk."""
+        result = encode_message_bulk(b'', 5)
+        assert result == [encode_chunk(b'_____')]
+
+
+class TestBase32Hex:
+    """Tests for the opt-in base32hex encoding."""
+    
+    @pytest.mark.parametrize('data', [b'hello', b'hello___', bytes(range(13))])
+    def test_matches_stdlib(self, data):
+        """Encoding matches base64.b32hexencode, lowercased and unpadded."""
+        expected = base64.b32hexencode(data).decode('ascii').rstrip('=').lower()
+        assert encode_chunk(data, encoding='base32hex') == expected
+    
+    @pytest.mark.parametrize('chunk_size', [5, 8])
+    def test_roundtrip(self, chunk_size):
+        """Messages round trip through base32hex."""
+        message = 'hello from nsec cache datastore'
+        chunks = encode_message(message, chunk_size, encoding='base32hex')
+        decoded = decode_payload_chunks(chunks, encoding='base32hex')
+        assert decoded == message.encode('utf-8')
+    
+    def test_preserves_byte_order(self):
+        """Encoded labels sort in the same order as the input bytes."""
+        data = [bytes([i, 255 - i, i]) for i in range(0, 256, 7)]
+        encoded = [encode_chunk(d, encoding='base32hex') for d in data]
+        assert sorted(encoded) == [encode_chunk(d, encoding='base32hex')
+                                   for d in sorted(data)]
+    
+    def test_unknown_encoding(self):
+        """Unknown encodings raise ValueError."""
+        with pytest.raises(ValueError):
+            encode_chunk(b'hello', encoding='base64')
+        with pytest.raises(ValueError):
+            decode_labels('nbswy3dp', encoding='base64')
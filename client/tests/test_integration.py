@@ -7,8 +7,10 @@ They spin up the full demo environment and verify the behavior.
 
 import json
 import os
+import queue
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 
@@ -30,10 +32,18 @@ def run_command(cmd: list, cwd: str = None, timeout: int = 120) -> subprocess.Co
     )
 
 
-def docker_compose_up(project_dir: str):
+def compose_command(env_file: Path = None) -> list:
+    """Return the docker compose command, reading env_file if given."""
+    cmd = ['docker', 'compose']
+    if env_file is not None:
+        cmd += ['--env-file', str(env_file)]
+    return cmd
+
+
+def docker_compose_up(project_dir: str, env_file: Path = None):
     """Start the docker-compose environment."""
     result = run_command(
-        ['docker', 'compose', 'up', '-d', '--build'],
+        compose_command(env_file) + ['up', '-d', '--build'],
         cwd=project_dir,
         timeout=300
     )
@@ -42,123 +52,195 @@ def docker_compose_up(project_dir: str):
     return result.returncode == 0
 
 
-def docker_compose_down(project_dir: str):
+def docker_compose_down(project_dir: str, env_file: Path = None):
     """Stop the docker-compose environment."""
     run_command(
-        ['docker', 'compose', 'down', '--remove-orphans', '-v'],
+        compose_command(env_file) + ['down', '--remove-orphans', '-v'],
         cwd=project_dir,
         timeout=60
     )
 
 
-def wait_for_services(max_wait: int = 60) -> bool:
-    """Wait for services to be healthy."""
+class ContainerWorker:
+    """
+    A long-lived scripts/worker.py process in the client container.
+    
+    Commands go over one 'docker exec -i' pipe, one line each, and every
+    reply is a single JSON line, so container entry and Python startup
+    are paid once rather than per check. A worker that exits or stops
+    answering is killed and started again on the next call.
+    """
+    
+    def __init__(self, container: str = 'nsec-client', timeout: float = 120):
+        self.container = container
+        self.timeout = timeout
+        self._start()
+    
+    def _spawn(self) -> subprocess.Popen:
+        """Start the worker process."""
+        return subprocess.Popen(
+            ['docker', 'exec', '-i', self.container,
+             'python3', '/app/scripts/worker.py'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+    
+    def _start(self):
+        """Start a worker and a thread that queues its reply lines."""
+        self.proc = self._spawn()
+        self.replies = queue.Queue()
+        threading.Thread(
+            target=self._read_replies,
+            args=(self.proc.stdout, self.replies),
+            daemon=True
+        ).start()
+    
+    @staticmethod
+    def _read_replies(stdout, replies: queue.Queue):
+        """Queue every line from stdout, then None at EOF."""
+        for line in stdout:
+            replies.put(line)
+        replies.put(None)
+    
+    def call(self, command: str, timeout: float = None) -> dict:
+        """
+        Send one command and return the decoded reply.
+        
+        Raises:
+            RuntimeError: The worker exited before replying
+            TimeoutError: No reply within timeout (default self.timeout);
+                the worker is killed
+            OSError: The command could not be written (worker gone)
+        """
+        if self.proc.poll() is not None:
+            self._start()
+        
+        self.proc.stdin.write(command + '\n')
+        self.proc.stdin.flush()
+        
+        try:
+            line = self.replies.get(timeout=timeout or self.timeout)
+        except queue.Empty:
+            self.proc.kill()
+            self.proc.wait()
+            raise TimeoutError(f"worker did not answer {command!r} in time")
+        
+        if line is None:
+            self.proc.wait()
+            raise RuntimeError(f"worker exited while running {command!r}")
+        return json.loads(line)
+    
+    def close(self):
+        """Stop the worker by closing its stdin."""
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+
+
+def wait_for_services(worker: ContainerWorker, max_wait: int = 60) -> bool:
+    """
+    Wait for services to be healthy.
+    
+    Probes start 0.1 s apart and back off exponentially to 2 s, so a
+    stack that is already up is detected almost immediately. A worker
+    that died or hung is restarted by the next probe.
+    """
     start = time.time()
+    delay = 0.1
     while time.time() - start < max_wait:
         # Check if recursor can resolve
-        result = run_command([
-            'docker', 'exec', 'nsec-client',
-            'python3', '-c',
-            '''
-import dns.resolver
-r = dns.resolver.Resolver()
-r.nameservers = ["172.28.0.3"]
-r.lifetime = 2
-try:
-    r.resolve("ns1.zone.test.", "A")
-    print("OK")
-except Exception as e:
-    print(f"FAIL: {e}")
-    exit(1)
-'''
-        ])
-        if result.returncode == 0 and 'OK' in result.stdout:
-            return True
-        time.sleep(2)
+        try:
+            if worker.call('ping', timeout=10).get('ok'):
+                return True
+        except (RuntimeError, OSError):
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, 2.0)
     return False
 
 
-def run_prime(project_dir: str) -> dict:
+def run_prime(worker: ContainerWorker) -> dict:
     """Run the priming script and return results."""
-    result = run_command([
-        'docker', 'exec', 'nsec-client',
-        'python3', '/app/scripts/prime.py'
-    ], cwd=project_dir)
+    reply = worker.call('prime')
     
-    if result.returncode != 0:
-        print(f"Prime failed: {result.stderr}")
+    if reply['returncode'] != 0:
+        print(f"Prime failed: {reply['output']}")
         return None
     
-    # Read results file
-    result = run_command([
-        'docker', 'exec', 'nsec-client',
-        'cat', '/results/prime_results.json'
-    ])
-    
-    if result.returncode == 0:
-        return json.loads(result.stdout)
-    return None
+    return reply['results']
 
 
-def run_verify(project_dir: str) -> dict:
+def run_verify(worker: ContainerWorker) -> dict:
     """Run the verification script and return results."""
-    result = run_command([
-        'docker', 'exec', 'nsec-client',
-        'python3', '/app/scripts/verify_synthesis.py'
-    ], cwd=project_dir)
+    return worker.call('verify')['results']
+
+
+@pytest.fixture(scope="session")
+def project_dir():
+    """Get the project root directory."""
+    # Navigate up from tests directory
+    return str(Path(__file__).parent.parent.parent)
+
+
+@pytest.fixture(scope="session")
+def docker_environment(project_dir, tmp_path_factory):
+    """
+    Setup and teardown the Docker environment.
+    
+    Session-scoped so every integration test class shares a single
+    docker compose up/down and a single in-container worker.
+    """
+    # Without a .env, compose reads a temp copy of env.example, so the
+    # test run never writes into the checkout
+    env_example = Path(project_dir) / 'env.example'
+    env_file = None
+    
+    if env_example.exists() and not (Path(project_dir) / '.env').exists():
+        env_file = tmp_path_factory.mktemp('compose') / '.env'
+        env_file.write_text(env_example.read_text())
+    
+    # Start environment
+    print("\n[+] Starting Docker environment...")
+    success = docker_compose_up(project_dir, env_file)
     
-    # Read results file
-    result = run_command([
-        'docker', 'exec', 'nsec-client',
-        'cat', '/results/verify_results.json'
-    ])
+    if not success:
+        pytest.skip("Could not start Docker environment")
     
-    if result.returncode == 0:
-        return json.loads(result.stdout)
-    return None
+    # One worker process serves every in-container Python check
+    worker = ContainerWorker()
+    
+    # Wait for services
+    print("[+] Waiting for services to be healthy...")
+    if not wait_for_services(worker):
+        worker.close()
+        docker_compose_down(project_dir, env_file)
+        pytest.skip("Services did not become healthy in time")
+    
+    print("[+] Services are ready")
+    
+    yield worker
+    
+    # Teardown
+    print("\n[+] Tearing down Docker environment...")
+    worker.close()
+    docker_compose_down(project_dir, env_file)
+
+
+@pytest.fixture
+def worker(docker_environment):
+    """The in-container worker started by docker_environment."""
+    return docker_environment
 
 
 @pytest.mark.skipif(SKIP_INTEGRATION, reason="Integration tests disabled")
+@pytest.mark.usefixtures("docker_environment")
 class TestIntegration:
     """Integration tests for the full demo flow."""
     
-    @pytest.fixture(scope="class")
-    def project_dir(self):
-        """Get the project root directory."""
-        # Navigate up from tests directory
-        return str(Path(__file__).parent.parent.parent)
-    
-    @pytest.fixture(scope="class", autouse=True)
-    def setup_environment(self, project_dir):
-        """Setup and teardown the Docker environment."""
-        # Ensure .env exists
-        env_example = Path(project_dir) / 'env.example'
-        env_file = Path(project_dir) / '.env'
-        
-        if env_example.exists() and not env_file.exists():
-            env_file.write_text(env_example.read_text())
-        
-        # Start environment
-        print("\n[+] Starting Docker environment...")
-        success = docker_compose_up(project_dir)
-        
-        if not success:
-            pytest.skip("Could not start Docker environment")
-        
-        # Wait for services
-        print("[+] Waiting for services to be healthy...")
-        if not wait_for_services():
-            docker_compose_down(project_dir)
-            pytest.skip("Services did not become healthy in time")
-        
-        print("[+] Services are ready")
-        
-        yield
-        
-        # Teardown
-        print("\n[+] Tearing down Docker environment...")
-        docker_compose_down(project_dir)
-    
     def test_services_running(self, project_dir):
         """Test that all services are running."""
         result = run_command(['docker', 'ps', '--format', '{{.Names}}'])
@@ -195,26 +277,26 @@ class TestIntegration:
         # Should have DNSKEY records
         assert '256' in result.stdout or '257' in result.stdout
     
-    def test_priming_extracts_payload(self, project_dir):
+    def test_priming_extracts_payload(self, worker):
         """Test that priming extracts the payload correctly."""
-        prime_results = run_prime(project_dir)
+        prime_results = run_prime(worker)
         
         assert prime_results is not None
         assert 'decoded_payload' in prime_results
         assert 'hello' in prime_results['decoded_payload'].lower()
         assert prime_results['priming_queries'] > 0
     
-    def test_verification_uses_cache(self, project_dir):
+    def test_verification_uses_cache(self, worker):
         """Test that verification queries use cached NSEC records."""
         # First ensure priming has run
-        prime_results = run_prime(project_dir)
+        prime_results = run_prime(worker)
         assert prime_results is not None
         
         # Small delay to ensure cache is populated
         time.sleep(1)
         
         # Run verification
-        verify_results = run_verify(project_dir)
+        verify_results = run_verify(worker)
         
         assert verify_results is not None
         assert 'delta' in verify_results
@@ -225,14 +307,14 @@ class TestIntegration:
         delta = verify_results['delta']
         assert delta <= 1, f"Expected Δ ≤ 1, got Δ = {delta}"
     
-    def test_payload_matches_in_verification(self, project_dir):
+    def test_payload_matches_in_verification(self, worker):
         """Test that payload extracted during verification matches priming."""
-        prime_results = run_prime(project_dir)
+        prime_results = run_prime(worker)
         assert prime_results is not None
         
         time.sleep(1)
         
-        verify_results = run_verify(project_dir)
+        verify_results = run_verify(worker)
         assert verify_results is not None
         
         # Payloads should match
@@ -245,12 +327,12 @@ class TestIntegration:
         # but should extract something
         assert len(verify_results.get('payload_chunks', [])) > 0
     
-    def test_full_demo_flow(self, project_dir):
+    def test_full_demo_flow(self, worker):
         """Test the complete demo flow end-to-end."""
         # This is the main acceptance test
         
         # 1. Prime
-        prime_results = run_prime(project_dir)
+        prime_results = run_prime(worker)
         assert prime_results is not None
         assert prime_results['priming_queries'] > 0
         
@@ -258,7 +340,7 @@ class TestIntegration:
         time.sleep(1)
         
         # 3. Verify
-        verify_results = run_verify(project_dir)
+        verify_results = run_verify(worker)
         assert verify_results is not None
         
         # 4. Check the key metric
@@ -274,13 +356,13 @@ class TestIntegration:
 
 
 @pytest.mark.skipif(SKIP_INTEGRATION, reason="Integration tests disabled")
+@pytest.mark.usefixtures("docker_environment")
 class TestDNSBehavior:
     """Tests for specific DNS behavior."""
     
     def test_nsec_in_nxdomain_response(self):
         """Test that NXDOMAIN responses include NSEC records."""
         # This test can run against any DNSSEC-signed zone
-        # For now, skip if not in Docker environment
         result = run_command([
             'docker', 'exec', 'nsec-client',
             'dig', '@172.28.0.3', 'nonexistent.zone.test.', 'A', '+dnssec'
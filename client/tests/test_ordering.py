@@ -5,17 +5,16 @@ Tests DNS name generation, in-gap name generation, and lexicographic ordering.
 """
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from nsecchain.ordering import (
     node_name_for_index,
+    index_labels,
     in_gap_name,
+    in_gap_names,
     verification_in_gap_name,
+    verification_in_gap_names,
     is_name_between,
+    CanonName,
     extract_index_from_name,
     parse_node_name,
     get_next_node_index
@@ -54,6 +53,17 @@ class TestNodeNameForIndex:
         assert result1 == result2
 
 
+class TestIndexLabels:
+    """Tests for index_labels function."""
+    
+    @pytest.mark.parametrize('count', [0, 1, 10000, 10002])
+    def test_matches_node_name_prefix(self, count):
+        """Labels match the index label of node_name_for_index."""
+        expected = [node_name_for_index(i, 'p', 'zone.test').split('.')[0]
+                    for i in range(count)]
+        assert list(index_labels(count)) == expected
+
+
 class TestInGapName:
     """Tests for in_gap_name function."""
     
@@ -78,6 +88,24 @@ class TestInGapName:
         assert result == 'n0000z.zone.test'
 
 
+class TestInGapNames:
+    """Tests for batch in-gap name generation."""
+    
+    def test_matches_single(self):
+        """Batch names match in_gap_name index by index."""
+        names = in_gap_names(12, 'zone.test.', suffix='y')
+        assert names == [in_gap_name(i, 'zone.test', suffix='y') for i in range(12)]
+    
+    def test_verification_matches_single(self):
+        """Verification batch names match verification_in_gap_name."""
+        names = verification_in_gap_names(5, 'zone.test', variant=1)
+        assert names == [verification_in_gap_name(i, 'zone.test', variant=1) for i in range(5)]
+    
+    def test_empty(self):
+        """Zero nodes give no names."""
+        assert in_gap_names(0, 'zone.test') == []
+
+
 class TestVerificationInGapName:
     """Tests for verification_in_gap_name function."""
     
@@ -125,6 +153,14 @@ class TestIsBetween:
     def test_case_insensitive(self):
         """Comparison should be case-insensitive."""
         assert is_name_between('N0000Z.zone.test.', 'n0000.a.zone.test.', 'N0001.zone.test.')
+    
+    def test_canon_name_bounds(self):
+        """Pre-normalized bounds give the same result as strings."""
+        lower = CanonName.from_text('N0000.a.zone.test.')
+        upper = CanonName.from_text('n0001.zone.test')
+        assert is_name_between('n0000z.zone.test.', lower, upper)
+        assert not is_name_between('n0002.zone.test.', lower, upper)
+        assert CanonName.from_text('N0000.a.zone.test.') is lower
 
 
 class TestExtractIndexFromName:
@@ -146,6 +182,14 @@ class TestExtractIndexFromName:
         assert extract_index_from_name('invalid.zone.test.') is None
         assert extract_index_from_name('zone.test.') is None
         assert extract_index_from_name('x0000.zone.test.') is None
+    
+    def test_four_digit_fast_path_edges(self):
+        """Labels that only start like a 4-digit index use the full check."""
+        assert extract_index_from_name('N0042.payload.zone.test.') == 42
+        assert extract_index_from_name('n0042') == 42
+        assert extract_index_from_name('n00042.payload.zone.test.') == 42
+        assert extract_index_from_name('n0042x.payload.zone.test.') is None
+        assert extract_index_from_name('n00a2.payload.zone.test.') is None
 
 
 class TestParseNodeName:
@@ -183,6 +227,11 @@ class TestParseNodeName:
         """Invalid node format should return None."""
         result = parse_node_name('invalid.zone.test.', 'zone.test')
         assert result is None
+    
+    def test_zone_dots_are_literal(self):
+        """Dots in the zone only match dots, not any character."""
+        assert parse_node_name('n0001.payload.zonextest.', 'zone.test') is None
+        assert parse_node_name('n0001.payload.zone.test.', 'zone.test.') == (1, 'payload')
 
 
 class TestLexicographicOrdering:
@@ -0,0 +1,447 @@
+"""
+Unit tests for the parser module.
+
+Tests payload extraction from NSEC next names.
+"""
+
+import asyncio
+import socket
+import threading
+
+import pytest
+
+import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.resolver
+import dns.rrset
+
+import nsecchain.parser
+from nsecchain.parser import (
+    ZoneContext,
+    extract_payload_from_next_name,
+    extract_payloads,
+    make_resolver,
+    query_and_extract_nsec,
+    aquery_nsec_direct,
+    batch_query_sync,
+    query_and_extract_nsec_batch,
+    _result_from_response,
+)
+
+
+def make_response(qname: str, rcode: int, nsec_next: str = None) -> dns.message.Message:
+    """Build a response to an A query, optionally carrying one NSEC record."""
+    query = dns.message.make_query(qname, 'A', want_dnssec=True)
+    response = dns.message.make_response(query)
+    response.set_rcode(rcode)
+    if nsec_next:
+        response.authority.append(dns.rrset.from_text(
+            'n0000.payload.zone.test.', 60, 'IN', 'NSEC', f'{nsec_next} A RRSIG NSEC'
+        ))
+    return response
+
+
+class TestZoneContext:
+    """Tests for ZoneContext normalization."""
+    
+    def test_from_zone(self):
+        """Zone is lowercased and stripped of its trailing dot."""
+        ctx = ZoneContext.from_zone('Zone.Test.')
+        assert ctx.zone_labels == (b'zone', b'test')
+    
+    def test_non_ascii_zone(self):
+        """A non-ASCII zone matches no name instead of raising."""
+        ctx = ZoneContext.from_zone('zöne.test')
+        assert ctx.zone_labels is None
+        name = dns.name.from_text('n0001.nbswy3dp.zöne.test.')
+        assert extract_payload_from_next_name(name, 'zöne.test') is None
+    
+    def test_from_existing_context(self):
+        """An existing context is returned unchanged."""
+        ctx = ZoneContext.from_zone('zone.test')
+        assert ZoneContext.from_zone(ctx) is ctx
+
+
+class TestExtractPayloadFromNextName:
+    """Tests for extract_payload_from_next_name function."""
+    
+    def test_basic_extraction(self):
+        """Test basic payload extraction."""
+        name = dns.name.from_text('n0001.nbswy3dp.zone.test.')
+        assert extract_payload_from_next_name(name, 'zone.test') == 'nbswy3dp'
+    
+    def test_with_zone_context(self):
+        """A ZoneContext gives the same result as the zone string."""
+        name = dns.name.from_text('n0001.abc.def.zone.test.')
+        ctx = ZoneContext.from_zone('zone.test')
+        assert extract_payload_from_next_name(name, ctx) == 'abc.def'
+    
+    def test_case_insensitive(self):
+        """Extraction is case-insensitive."""
+        name = dns.name.from_text('N0001.NBSWY3DP.Zone.Test.')
+        assert extract_payload_from_next_name(name, 'zone.test') == 'nbswy3dp'
+    
+    def test_end_marker(self):
+        """The end marker yields its label as payload."""
+        name = dns.name.from_text('n0004.end.zone.test.')
+        assert extract_payload_from_next_name(name, 'zone.test') == 'end'
+    
+    def test_relative_name(self):
+        """Relative names are matched the same as absolute ones."""
+        name = dns.name.from_text('n0001.nbswy3dp.zone.test', origin=None)
+        assert extract_payload_from_next_name(name, 'zone.test') == 'nbswy3dp'
+    
+    @pytest.mark.parametrize('text', ['n0001.payload.other.test.', 'zone.test.',
+                                      'ns1.zone.test.', 'x0001.payload.zone.test.',
+                                      'n0001.payload.xzone.test.'])
+    def test_invalid_names(self, text):
+        """Names outside the zone or without a node label return None."""
+        name = dns.name.from_text(text)
+        assert extract_payload_from_next_name(name, 'zone.test') is None
+
+
+class TestPackageExports:
+    """Tests for the lazily loaded parser exports of the package."""
+    
+    def test_lazy_exports(self):
+        """Parser names are reachable from the package namespace."""
+        import nsecchain
+        assert nsecchain.ZoneContext is ZoneContext
+        assert nsecchain.extract_payloads is extract_payloads
+    
+    def test_unknown_attribute(self):
+        """Unknown names still raise AttributeError."""
+        import nsecchain
+        with pytest.raises(AttributeError):
+            nsecchain.not_a_parser_function
+
+
+class TestExtractPayloads:
+    """Tests for extracting payloads from batch query results."""
+    
+    def test_mixed_results(self):
+        """Each result maps to its next name text and payload, in order."""
+        results = [
+            (dns.name.from_text('n0001.nbswy3dp.zone.test.'), None),
+            (None, None),
+            (dns.name.from_text('n0001.payload.other.test.'), None),
+        ]
+        assert extract_payloads(results, 'zone.test') == [
+            ('n0001.nbswy3dp.zone.test.', 'nbswy3dp'),
+            (None, None),
+            ('n0001.payload.other.test.', None),
+        ]
+
+
+class TestResultFromResponse:
+    """Tests for interpreting raw responses from direct queries."""
+    
+    def test_nxdomain_with_nsec(self):
+        """NXDOMAIN responses yield the NSEC next name."""
+        response = make_response('n0000z.zone.test.', dns.rcode.NXDOMAIN,
+                                 'n0001.nbswy3dp.zone.test.')
+        next_name, returned = _result_from_response('n0000z.zone.test.', response)
+        assert next_name == dns.name.from_text('n0001.nbswy3dp.zone.test.')
+        assert returned is response
+    
+    def test_nxdomain_without_nsec(self):
+        """NXDOMAIN without NSEC yields no next name but keeps the response."""
+        response = make_response('n0000z.zone.test.', dns.rcode.NXDOMAIN)
+        assert _result_from_response('n0000z.zone.test.', response) == (None, response)
+    
+    def test_server_failure(self):
+        """Error rcodes yield (None, None)."""
+        response = make_response('n0000z.zone.test.', dns.rcode.SERVFAIL)
+        assert _result_from_response('n0000z.zone.test.', response) == (None, None)
+
+
+class TestBatchLimits:
+    """Invalid concurrency and retry limits are rejected up front."""
+    
+    def test_zero_concurrency(self):
+        """A zero-size semaphore would block the batch forever."""
+        with pytest.raises(ValueError):
+            batch_query_sync(['n0000z.zone.test.'], '127.0.0.1', concurrency=0)
+    
+    def test_negative_retries(self):
+        """Negative retries would send no query at all."""
+        with pytest.raises(ValueError):
+            batch_query_sync(['n0000z.zone.test.'], '127.0.0.1', retries=-1)
+        with pytest.raises(ValueError):
+            query_and_extract_nsec_batch(['n0000z.zone.test.'], '127.0.0.1', retries=-1)
+        with pytest.raises(ValueError):
+            asyncio.run(aquery_nsec_direct('n0000z.zone.test.', '127.0.0.1', retries=-1))
+
+
+class TestQueryResolverCache:
+    """Tests for resolver reuse in query_and_extract_nsec."""
+    
+    class FailingResolver:
+        """Stands in for a resolver without sending any query."""
+        
+        def resolve(self, name, rdtype):
+            raise OSError('no network in tests')
+    
+    def test_make_resolver(self):
+        """Resolvers query only resolver_ip, with the DO bit set."""
+        resolver = make_resolver('192.0.2.53', timeout=2.0)
+        assert resolver.nameservers == ['192.0.2.53']
+        assert resolver.lifetime == 2.0
+        assert resolver.ednsflags & dns.flags.DO
+    
+    def test_resolver_cached_per_ip_and_timeout(self, monkeypatch):
+        """One resolver is built per (resolver_ip, timeout) and then reused."""
+        built = []
+        
+        def fake_make_resolver(resolver_ip, timeout=5.0):
+            built.append((resolver_ip, timeout))
+            return self.FailingResolver()
+        
+        monkeypatch.setattr(nsecchain.parser, 'make_resolver', fake_make_resolver)
+        monkeypatch.setattr(nsecchain.parser, '_default_resolvers', {})
+        
+        for _ in range(3):
+            assert query_and_extract_nsec('n0000z.zone.test.', '192.0.2.53') == (None, None)
+        query_and_extract_nsec('n0000z.zone.test.', '192.0.2.53', timeout=1.0)
+        query_and_extract_nsec('n0000z.zone.test.', '192.0.2.54')
+        
+        assert built == [('192.0.2.53', 5.0), ('192.0.2.53', 1.0), ('192.0.2.54', 5.0)]
+    
+    def test_nxdomain_yields_next_name(self):
+        """The NSEC next name is read from the response an NXDOMAIN carries."""
+        qname = dns.name.from_text('n0000z.zone.test.')
+        response = make_response('n0000z.zone.test.', dns.rcode.NXDOMAIN,
+                                 nsec_next='n0001.nbswy3dp.zone.test.')
+        
+        class NXDomainResolver:
+            """Raises NXDOMAIN the way dnspython's resolver does."""
+            
+            def resolve(self, name, rdtype):
+                raise dns.resolver.NXDOMAIN(qnames=[qname], responses={qname: response})
+        
+        next_name, got = query_and_extract_nsec('n0000z.zone.test.', '192.0.2.53',
+                                                resolver=NXDomainResolver())
+        assert next_name == dns.name.from_text('n0001.nbswy3dp.zone.test.')
+        assert got is response
+    
+    def test_explicit_resolver_bypasses_cache(self, monkeypatch):
+        """A resolver passed in is used as is."""
+        monkeypatch.setattr(nsecchain.parser, '_default_resolvers', {})
+        query_and_extract_nsec('n0000z.zone.test.', '192.0.2.53',
+                               resolver=self.FailingResolver())
+        assert nsecchain.parser._default_resolvers == {}
+
+
+class FakeTCPResolver:
+    """
+    A local DNS-over-TCP server that answers pipelined queries out of order.
+    
+    Each connection reads every query the client sends, then answers them
+    in reverse order with an NXDOMAIN whose NSEC points at the next node.
+    Queries for names in `drop` go unanswered on the first connection only.
+    """
+    
+    def __init__(self, drop=()):
+        self.drop = set(drop)
+        self.connections = 0
+        self.listener = socket.create_server(('127.0.0.1', 0))
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+    
+    @staticmethod
+    def next_name(qname: str) -> str:
+        """The NSEC next name answered for an in-gap query name."""
+        index = int(qname[1:5])
+        return f'n{index + 1:04d}.payload{index}.zone.test.'
+    
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            with conn:
+                self._answer(conn, drop=self.drop if self.connections == 1 else set())
+    
+    def _answer(self, conn: socket.socket, drop: set):
+        # The client writes all its queries at once; stop reading once
+        # nothing more arrives for a moment
+        conn.settimeout(0.2)
+        data = b''
+        try:
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        except socket.timeout:
+            pass
+        conn.settimeout(None)
+        
+        queries = []
+        while len(data) >= 2:
+            size = int.from_bytes(data[:2], 'big')
+            queries.append(dns.message.from_wire(data[2:2 + size]))
+            data = data[2 + size:]
+        
+        for query in reversed(queries):
+            qname = query.question[0].name.to_text()
+            if qname in drop:
+                continue
+            response = make_response(qname, dns.rcode.NXDOMAIN, self.next_name(qname))
+            response.id = query.id
+            wire = response.to_wire()
+            conn.sendall(len(wire).to_bytes(2, 'big') + wire)
+        
+        # Hold the connection until the client gives up on it
+        try:
+            while conn.recv(4096):
+                pass
+        except OSError:
+            pass
+    
+    def close(self):
+        self.listener.close()
+
+
+class TestQueryAndExtractNsecBatch:
+    """Tests for pipelined TCP queries against a local fake resolver."""
+    
+    NAMES = [f'n{i:04d}z.zone.test.' for i in range(6)]
+    
+    def expected(self, name: str) -> dns.name.Name:
+        return dns.name.from_text(FakeTCPResolver.next_name(name))
+    
+    def test_out_of_order_responses_matched_by_id(self):
+        """Responses arriving in reverse order land in their query's slot."""
+        server = FakeTCPResolver()
+        try:
+            results = query_and_extract_nsec_batch(self.NAMES, '127.0.0.1',
+                                                   timeout=2.0, port=server.port)
+        finally:
+            server.close()
+        
+        assert [next_name for next_name, _ in results] == \
+            [self.expected(name) for name in self.NAMES]
+        assert server.connections == 1
+    
+    def test_dropped_reply_retried_on_new_connection(self):
+        """An unanswered query is resent on a fresh connection."""
+        dropped = self.NAMES[2]
+        server = FakeTCPResolver(drop=[dropped])
+        try:
+            results = query_and_extract_nsec_batch(self.NAMES, '127.0.0.1', timeout=0.5,
+                                                   retries=1, port=server.port)
+        finally:
+            server.close()
+        
+        assert [next_name for next_name, _ in results] == \
+            [self.expected(name) for name in self.NAMES]
+        assert server.connections == 2
+    
+    def test_dropped_reply_without_retries(self):
+        """Without retries the unanswered slot stays empty and the rest are kept."""
+        dropped = self.NAMES[2]
+        server = FakeTCPResolver(drop=[dropped])
+        try:
+            results = query_and_extract_nsec_batch(self.NAMES, '127.0.0.1', timeout=0.5,
+                                                   port=server.port)
+        finally:
+            server.close()
+        
+        assert results[2] == (None, None)
+        for i, name in enumerate(self.NAMES):
+            if i != 2:
+                assert results[i][0] == self.expected(name)
+
+
+class FakeUDPResolver:
+    """
+    A local DNS-over-UDP server that answers every query with an NXDOMAIN.
+    
+    The NSEC in each answer points at the next node. The first datagram
+    for each name in `drop` goes unanswered; later ones are answered.
+    """
+    
+    def __init__(self, drop=()):
+        self.drop = set(drop)
+        self.received = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+    
+    def _serve(self):
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(65536)
+            except OSError:
+                return
+            query = dns.message.from_wire(data)
+            qname = query.question[0].name.to_text()
+            self.received.append(qname)
+            if qname in self.drop:
+                self.drop.discard(qname)
+                continue
+            response = make_response(qname, dns.rcode.NXDOMAIN,
+                                     FakeTCPResolver.next_name(qname))
+            response.id = query.id
+            self.sock.sendto(response.to_wire(), addr)
+    
+    def close(self):
+        self.sock.close()
+
+
+class TestBatchQueryUDP:
+    """Tests for concurrent UDP queries against a local fake resolver."""
+    
+    NAMES = [f'n{i:04d}z.zone.test.' for i in range(6)]
+    
+    def expected(self, name: str) -> dns.name.Name:
+        return dns.name.from_text(FakeTCPResolver.next_name(name))
+    
+    def test_all_answered(self):
+        """Every name gets the next name from its own reply."""
+        server = FakeUDPResolver()
+        try:
+            results = batch_query_sync(self.NAMES, '127.0.0.1', timeout=2.0,
+                                       port=server.port)
+        finally:
+            server.close()
+        
+        assert [next_name for next_name, _ in results] == \
+            [self.expected(name) for name in self.NAMES]
+    
+    def test_dropped_datagram_retried(self):
+        """A query whose first datagram is dropped is answered on retry."""
+        dropped = self.NAMES[2]
+        server = FakeUDPResolver(drop=[dropped])
+        try:
+            results = batch_query_sync(self.NAMES, '127.0.0.1', timeout=0.5,
+                                       retries=1, port=server.port)
+        finally:
+            server.close()
+        
+        assert [next_name for next_name, _ in results] == \
+            [self.expected(name) for name in self.NAMES]
+        assert server.received.count(dropped) == 2
+    
+    def test_dropped_datagram_without_retries(self, capsys):
+        """Without retries the dropped name stays (None, None)."""
+        dropped = self.NAMES[2]
+        server = FakeUDPResolver(drop=[dropped])
+        try:
+            results = batch_query_sync(self.NAMES, '127.0.0.1', timeout=0.5,
+                                       port=server.port)
+        finally:
+            server.close()
+        
+        assert results[2] == (None, None)
+        for i, name in enumerate(self.NAMES):
+            if i != 2:
+                assert results[i][0] == self.expected(name)
+        assert server.received.count(dropped) == 1
+        assert dropped in capsys.readouterr().out